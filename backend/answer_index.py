@@ -0,0 +1,162 @@
+"""Tolerant answer matching for quiz checks.
+
+For every term the index precomputes the accepted answer forms: the term
+itself and, for acronyms, the expansion written as "X - ..." at the start
+of its definition (e.g. "Application Programming Interface"), accepted
+only when the term spells out the expansion's words in order. Forms are
+compared case-, space- and punctuation-insensitively, so "ci cd" matches
+"CI/CD", and a small length-dependent edit distance is tolerated
+("Kubernates").
+
+Suggestions ("did you mean") use a deletion-neighbourhood index instead of
+a scan: every form is stored under itself and its single-character
+deletions, and a typed answer is looked up by its own deletions of up to
+two characters. That finds every catalog form within one edit, and forms
+within two edits when at most one of them is a substitution or a missing
+letter, with a handful of dict lookups regardless of catalog size.
+"""
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from term_cache import TermCatalog, TermRecord
+
+MAX_EXPANSION_WORDS = 8
+MAX_QUERY_DELETES_LENGTH = 24
+MAX_SUGGEST_DISTANCE = 2
+
+_NON_WORD = re.compile(r"[\W_]+")
+_WORD_BREAK = re.compile(r"[\s/-]+")
+
+# Words an acronym may leave out, e.g. the "a" in "Software as a Service" (SaaS)
+ACRONYM_STOPWORDS = frozenset({"a", "an", "and", "as", "for", "in", "of", "on", "the", "to"})
+
+
+def canonical(value: str) -> str:
+    return _NON_WORD.sub("", value.lower())
+
+
+def max_distance(length: int) -> int:
+    """Edits tolerated for a form of this length"""
+    if length <= 4:
+        return 0
+    if length <= 8:
+        return 1
+    return 2
+
+
+def levenshtein(a: str, b: str, bound: int) -> int:
+    """Edit distance, or bound + 1 as soon as it must exceed bound"""
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ca != cb)
+            ))
+        if min(current) > bound:
+            return bound + 1
+        previous = current
+    return previous[-1]
+
+
+def is_acronym(acronym: str, words: List[str]) -> bool:
+    """True if acronym is made of a non-empty prefix of each word, in order.
+
+    Prefixes longer than one letter cover "REST" (REpresentational State
+    Transfer); stopwords may be skipped.
+    """
+    def match(i: int, w: int) -> bool:
+        if w == len(words):
+            return i == len(acronym)
+        word = words[w]
+        if word in ACRONYM_STOPWORDS and match(i, w + 1):
+            return True
+        for n in range(1, len(word) + 1):
+            if acronym[i:i + n] != word[:n]:
+                break
+            if match(i + n, w + 1):
+                return True
+        return False
+
+    return bool(acronym) and match(0, 0)
+
+
+def expansion(term: TermRecord) -> Optional[str]:
+    """Parse "Application Programming Interface - ..." into its expansion"""
+    head, sep, _ = term.definition.partition(" - ")
+    words = [w for w in (canonical(part) for part in _WORD_BREAK.split(head)) if w]
+    if not sep or len(words) > MAX_EXPANSION_WORDS or not is_acronym(canonical(term.term), words):
+        return None
+    return head
+
+
+def accepted_forms(term: TermRecord) -> Tuple[str, ...]:
+    forms = [canonical(term.term)]
+    expanded = expansion(term)
+    if expanded:
+        forms.append(canonical(expanded))
+    return tuple(dict.fromkeys(f for f in forms if f))
+
+
+def _deletes(word: str, depth: int) -> Set[str]:
+    variants = frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        variants = variants | frontier
+    return variants
+
+
+class AnswerIndex:
+    def __init__(self, catalog: TermCatalog):
+        self.catalog = catalog
+        self.forms: Dict[int, Tuple[str, ...]] = {}
+        self.neighbours: Dict[str, List[Tuple[str, int]]] = {}
+        self.longest_form = 0
+        for term in catalog.terms:
+            forms = accepted_forms(term)
+            self.forms[term.id] = forms
+            for form in forms:
+                self.longest_form = max(self.longest_form, len(form))
+                for key in _deletes(form, 1):
+                    self.neighbours.setdefault(key, []).append((form, term.id))
+
+    def matches(self, term: TermRecord, answer: str) -> bool:
+        typed = canonical(answer)
+        if not typed:
+            return False
+        for form in self.forms.get(term.id) or accepted_forms(term):
+            bound = max_distance(len(form))
+            if typed == form or (bound and levenshtein(typed, form, bound) <= bound):
+                return True
+        return False
+
+    def suggest(self, answer: str) -> Optional[TermRecord]:
+        """Closest catalog term to answer, if any is within tolerance"""
+        typed = canonical(answer)
+        # Nothing in the catalog can be within MAX_SUGGEST_DISTANCE of a longer answer
+        if not typed or len(typed) > self.longest_form + MAX_SUGGEST_DISTANCE:
+            return None
+        depth = 2 if len(typed) <= MAX_QUERY_DELETES_LENGTH else 1
+
+        best: Optional[Tuple[int, int]] = None
+        seen = set()
+        for key in _deletes(typed, depth):
+            for form, term_id in self.neighbours.get(key, ()):
+                if (form, term_id) in seen:
+                    continue
+                seen.add((form, term_id))
+                bound = min(MAX_SUGGEST_DISTANCE, max(1, max_distance(len(form))))
+                distance = levenshtein(typed, form, bound)
+                if distance <= bound and (best is None or (distance, term_id) < best):
+                    best = (distance, term_id)
+        return self.catalog.get(best[1]) if best else None
+
+
+def get_answer_index(catalog: TermCatalog) -> AnswerIndex:
+    return catalog.derived("answer_index", AnswerIndex)
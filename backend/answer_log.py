@@ -0,0 +1,254 @@
+"""Per-term answer analytics.
+
+Every graded answer is appended to ``answer_events`` through a write-behind
+queue, so the check routes never wait on it; under overload events are
+dropped rather than slowing answers down. ``compact`` folds events past the
+watermark into ``term_answer_stats`` (attempts, correct count and a
+response-time histogram the median is read from) and advances the
+watermark in the same transaction. A background thread compacts every
+``answer_compaction_interval_seconds``; ``python answer_log.py`` runs one
+pass by hand. Readers only ever touch the rollups.
+"""
+import json
+import logging
+import threading
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal, run_write
+from models import AnswerEvent, RollupWatermark, TermAnswerStats
+from write_behind import QueueFull, WriteBehindQueue
+
+logger = logging.getLogger(__name__)
+
+WATERMARK = "term_answer_stats"
+COMPACT_CHUNK_SIZE = 50_000
+# Keeps the rollup lookup's IN list well under SQLite's bound-parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+RESPONSE_BUCKETS_MS = (
+    500, 1_000, 1_500, 2_000, 3_000, 4_000, 5_000, 7_500,
+    10_000, 15_000, 20_000, 30_000, 60_000, 120_000
+)
+
+# Accuracy at or above EASY_ACCURACY suggests "easy", below HARD_ACCURACY "hard"
+EASY_ACCURACY = 0.8
+HARD_ACCURACY = 0.5
+
+# ================= EVENT LOG =================
+
+def _append(db: Session, events: Sequence[dict]) -> List[None]:
+    db.execute(insert(AnswerEvent), list(events))
+    return [None] * len(events)
+
+
+answer_queue: WriteBehindQueue[dict] = WriteBehindQueue(
+    "answer_events",
+    _append,
+    max_batch=settings.answer_queue_max_batch,
+    max_delay=settings.answer_queue_max_delay_ms / 1000,
+    max_pending=settings.answer_queue_max_pending
+)
+
+
+def record_answers(user_id: int, answers: Iterable[Tuple[int, bool, Optional[int]]]) -> None:
+    """Queue (term_id, correct, response_ms) events; never blocks the caller"""
+    now = datetime.utcnow()
+    for term_id, correct, response_ms in answers:
+        try:
+            answer_queue.submit({
+                "term_id": term_id,
+                "user_id": user_id,
+                "correct": correct,
+                "response_ms": response_ms,
+                "created_at": now,
+            })
+        except QueueFull:
+            return  # counted in answer_queue.rejected
+
+# ================= ROLLUPS =================
+
+def median_ms(histogram: List[int]) -> Optional[float]:
+    """Median response time, interpolated inside its histogram bucket"""
+    total = sum(histogram)
+    if not total:
+        return None
+    half = total / 2
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count >= half:
+            lower = RESPONSE_BUCKETS_MS[index - 1] if index else 0
+            upper = RESPONSE_BUCKETS_MS[index] if index < len(RESPONSE_BUCKETS_MS) else lower
+            return lower + (upper - lower) * (half - seen) / count
+        seen += count
+    return None
+
+
+def suggest_difficulty(attempts: int, correct: int) -> Optional[str]:
+    if attempts < settings.analytics_min_attempts:
+        return None
+    accuracy = correct / attempts
+    if accuracy >= EASY_ACCURACY:
+        return "easy"
+    if accuracy >= HARD_ACCURACY:
+        return "medium"
+    return "hard"
+
+
+def _compact_chunk(db: Session) -> int:
+    """Fold one chunk of new events into the rollups; returns events folded"""
+    watermark = db.get(RollupWatermark, WATERMARK)
+    if watermark is None:
+        watermark = RollupWatermark(name=WATERMARK, last_event_id=0)
+        db.add(watermark)
+        db.flush()
+    start = watermark.last_event_id
+
+    events = db.query(
+        AnswerEvent.id, AnswerEvent.term_id, AnswerEvent.correct, AnswerEvent.response_ms
+    ).filter(AnswerEvent.id > start).order_by(AnswerEvent.id).limit(COMPACT_CHUNK_SIZE).all()
+    if not events:
+        return 0
+
+    deltas: Dict[int, list] = {}
+    for _, term_id, correct, response_ms in events:
+        delta = deltas.get(term_id)
+        if delta is None:
+            delta = deltas[term_id] = [0, 0, [0] * (len(RESPONSE_BUCKETS_MS) + 1)]
+        delta[0] += 1
+        delta[1] += 1 if correct else 0
+        if response_ms is not None:
+            delta[2][bisect_left(RESPONSE_BUCKETS_MS, response_ms)] += 1
+
+    term_ids = list(deltas)
+    existing = {}
+    for i in range(0, len(term_ids), LOOKUP_BATCH_SIZE):
+        batch = term_ids[i:i + LOOKUP_BATCH_SIZE]
+        for row in db.query(TermAnswerStats).filter(TermAnswerStats.term_id.in_(batch)):
+            existing[row.term_id] = row
+    for term_id, (attempts, correct, histogram) in deltas.items():
+        row = existing.get(term_id)
+        if row is None:
+            row = TermAnswerStats(term_id=term_id, attempts=0, correct=0)
+            db.add(row)
+            merged = histogram
+        else:
+            previous = json.loads(row.response_histogram)
+            merged = [a + b for a, b in zip(previous, histogram)]
+        row.attempts += attempts
+        row.correct += correct
+        row.response_histogram = json.dumps(merged)
+        row.median_response_ms = median_ms(merged)
+
+    # Only one compactor may advance the watermark from `start`; a
+    # concurrent one in another worker loses this race and rolls back.
+    advanced = db.execute(
+        update(RollupWatermark)
+        .where(RollupWatermark.name == WATERMARK, RollupWatermark.last_event_id == start)
+        .values(last_event_id=events[-1].id)
+    ).rowcount
+    if not advanced:
+        raise _LostRace()
+    return len(events)
+
+
+class _LostRace(Exception):
+    pass
+
+
+def compact() -> int:
+    """Fold every pending event into the rollups; returns events folded"""
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            try:
+                folded = run_write(db, _compact_chunk)
+            except _LostRace:
+                db.rollback()
+                return total
+            total += folded
+            if folded < COMPACT_CHUNK_SIZE:
+                return total
+    finally:
+        db.close()
+
+# ================= REPORTING =================
+
+def term_report(db: Session, catalog, sort: str, limit: int, mismatched_only: bool) -> List[dict]:
+    """Rollups joined with the catalog, plus a suggested difficulty"""
+    accuracy = TermAnswerStats.correct * 1.0 / TermAnswerStats.attempts
+    order = accuracy.asc() if sort == "accuracy" else TermAnswerStats.attempts.desc()
+    rows = db.query(TermAnswerStats).filter(TermAnswerStats.attempts > 0).order_by(
+        order, TermAnswerStats.term_id
+    )
+
+    report = []
+    for row in rows:
+        term = catalog.get(row.term_id)
+        if term is None:
+            continue  # deleted term
+        suggested = suggest_difficulty(row.attempts, row.correct)
+        if mismatched_only and (suggested is None or suggested == term.difficulty):
+            continue
+        report.append({
+            "term_id": row.term_id,
+            "term": term.term,
+            "difficulty": term.difficulty,
+            "attempts": row.attempts,
+            "accuracy": round(row.correct / row.attempts, 4),
+            "median_response_ms": row.median_response_ms,
+            "suggested_difficulty": suggested,
+        })
+        if len(report) >= limit:
+            break
+    return report
+
+
+def compacted_through(db: Session) -> int:
+    watermark = db.get(RollupWatermark, WATERMARK)
+    return watermark.last_event_id if watermark else 0
+
+# ================= BACKGROUND COMPACTION =================
+
+_stop = threading.Event()
+_compactor: Optional[threading.Thread] = None
+
+
+def _compact_loop() -> None:
+    while not _stop.wait(settings.answer_compaction_interval_seconds):
+        try:
+            compact()
+        except Exception:
+            logger.exception("answer compaction failed")
+
+
+def start_compactor() -> None:
+    global _compactor
+    if _compactor is None and settings.answer_compaction_interval_seconds > 0:
+        _stop.clear()
+        _compactor = threading.Thread(target=_compact_loop, name="answer-compactor", daemon=True)
+        _compactor.start()
+
+
+def stop(timeout: Optional[float] = None) -> None:
+    """Flush queued events, stop the compactor and fold what is left"""
+    global _compactor
+    answer_queue.close(timeout)
+    _stop.set()
+    if _compactor is not None:
+        _compactor.join(timeout)
+        _compactor = None
+    compact()
+
+
+if __name__ == "__main__":
+    from database import Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    print(f"✅ Compacted {compact()} answer events")
@@ -1,14 +1,23 @@
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 import hashlib
+import threading
+import time
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from database import get_db
+from config import settings
+from database import ReadSessionLocal, get_async_read_db, get_read_db
+from executors import BoundedExecutor, ExecutorSaturated
 from models import User
 
 # ================= CONFIG =================
@@ -17,6 +26,12 @@ SECRET_KEY = "your-secret-key-change-in-production-09876543210"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24
 
+PRINCIPAL_CACHE_SIZE = settings.principal_cache_size
+PRINCIPAL_CACHE_TTL_SECONDS = settings.principal_cache_ttl_seconds
+
+PASSWORD_HASH_WORKERS = settings.password_hash_workers
+PASSWORD_HASH_MAX_PENDING = settings.password_hash_max_pending
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -32,6 +47,28 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(_pre_hash(plain_password), hashed_password)
 
+# bcrypt gets its own pool so a login burst cannot starve the threadpool
+# that serves sync quiz/term routes.
+password_executor = BoundedExecutor(
+    "password-hash", PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+)
+
+async def _run_password_job(fn, *args):
+    try:
+        return await password_executor.run(fn, *args)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_password_job(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
 # ================= JWT =================
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -42,36 +79,156 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-# ================= DEPENDENCIES =================
+# ================= PRINCIPAL CACHE =================
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """Verified identity of the caller, detached from any session"""
+    id: int
+    username: str
+    is_admin: bool
+
+
+class PrincipalCache:
+    """Bounded LRU of token -> Principal; entries never outlive the token"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[Principal]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, token: str, principal: Principal, expires_at: float) -> None:
+        expires_at = min(expires_at, time.time() + self.ttl)
+        with self._lock:
+            self._entries[token] = (principal, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
 
-    credentials_exception = HTTPException(
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            stale = [t for t, (p, _) in self._entries.items() if p.id == user_id]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target):
+    principal_cache.invalidate_user(target.id)
+
+# ================= DEPENDENCIES =================
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid authentication credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+def _decode_token(token: str) -> Tuple[str, float]:
+    """Return (username, exp) from a valid token or raise 401"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username = payload.get("sub")
         if not username:
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    return username, payload.get("exp", 0)
 
-    user = db.query(User).filter(User.username == username).first()
+def _principal_query(username: str):
+    return select(User.id, User.username, User.is_admin).where(User.username == username)
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_read_db)
+) -> Principal:
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    username, expires_at = _decode_token(token)
+    user = db.execute(_principal_query(username)).first()
     if not user:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    return user
+    principal = Principal(user.id, user.username, bool(user.is_admin))
+    principal_cache.put(token, principal, expires_at)
+    return principal
+
+def principal_for_token(token: str) -> Optional[Principal]:
+    """get_current_user for code outside the dependency system; None if the token is invalid"""
+    db = ReadSessionLocal()
+    try:
+        return get_current_user(token, db)
+    except HTTPException:
+        return None
+    finally:
+        db.close()
+
+async def get_current_user_aio(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> Principal:
+    """get_current_user for the async stack; a cache hit never touches the db"""
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    username, expires_at = _decode_token(token)
+    user = (await db.execute(_principal_query(username))).first()
+    if not user:
+        raise _credentials_exception()
+
+    principal = Principal(user.id, user.username, bool(user.is_admin))
+    principal_cache.put(token, principal, expires_at)
+    return principal
 
 def get_current_admin(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: Principal = Depends(get_current_user)
+) -> Principal:
+    if not current_user.is_admin:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin access required"
+        )
+    return current_user
+
+async def get_current_admin_aio(
+    current_user: Principal = Depends(get_current_user_aio)
+) -> Principal:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=403,
@@ -90,3 +247,29 @@ def authenticate_user(
     if not verify_password(password, user.hashed_password):
         return None
     return user
+
+async def authenticate_user_async(
+    db: Session,
+    username: str,
+    password: str
+) -> Optional[User]:
+    user = await run_in_threadpool(
+        lambda: db.query(User).filter(User.username == username).first()
+    )
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
+
+async def authenticate_user_aio(
+    db: AsyncSession,
+    username: str,
+    password: str
+) -> Optional[User]:
+    user = await db.scalar(select(User).where(User.username == username))
+    if not user:
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        return None
+    return user
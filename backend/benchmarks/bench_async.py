@@ -0,0 +1,119 @@
+"""Concurrent request throughput: sync routes (threadpool) vs. async routes.
+
+Each mode starts its own uvicorn server on a fresh database, with
+TECH_VOCAB_DB_ASYNC set accordingly, then N concurrent clients hit a mix
+of DB-backed routes for a fixed time. Sync routes are capped by the
+threadpool (40 threads by default); async routes are not. Run from backend/:
+
+    python benchmarks/bench_async.py --concurrency 200 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+
+from auth_utils import create_access_token
+from loadgen import percentile
+
+ROUTES = [
+    ("GET", "/api/scores/my-history?limit=20", None),
+    ("GET", "/api/leaderboard?limit=10", None),
+    ("GET", "/api/quiz/due?count=5", None),
+    ("POST", "/api/scores", {"correct": 7, "total": 10}),
+]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(async_mode, port, workdir):
+    env = {
+        **os.environ,
+        "TECH_VOCAB_DB_ASYNC": "1" if async_mode else "0",
+        "TECH_VOCAB_DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env
+    )
+
+
+async def wait_ready(base_url, timeout=30):
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.perf_counter() < deadline:
+            try:
+                await client.get("/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def hammer(base_url, args):
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'user'})}"}
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        deadline = time.perf_counter() + args.seconds
+
+        async def worker(offset):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                method, url, body = ROUTES[i % len(ROUTES)]
+                i += 1
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, url, json=body)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(args.concurrency)))
+        return latencies, errors, time.perf_counter() - started
+
+
+def run(label, async_mode, args):
+    workdir = tempfile.mkdtemp()
+    port = free_port()
+    server = start_server(async_mode, port, workdir)
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        asyncio.run(wait_ready(base_url))
+        latencies, errors, elapsed = asyncio.run(hammer(base_url, args))
+    finally:
+        server.terminate()
+        server.wait()
+    print(
+        f"{label:<8} {len(latencies) / elapsed:>9.1f} req/s  "
+        f"p50 {percentile(latencies, 50) * 1000:>7.1f}ms  "
+        f"p95 {percentile(latencies, 95) * 1000:>7.1f}ms  "
+        f"p99 {percentile(latencies, 99) * 1000:>7.1f}ms  errors {errors}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.concurrency} concurrent clients, {args.seconds:.0f}s per mode\n")
+    run("sync", False, args)
+    run("async", True, args)
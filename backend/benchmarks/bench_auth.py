@@ -0,0 +1,103 @@
+"""Login throughput vs. quiz latency while logins are happening.
+
+Runs the ASGI app in-process and measures quiz endpoint latency twice:
+once on its own, then while a burst of concurrent logins runs bcrypt on
+the password executor. Run from backend/:
+
+    python benchmarks/bench_auth.py --logins 16 --quiz-clients 8 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The login burst is the load being measured; don't let the throttle turn it away
+os.environ.setdefault("TECH_VOCAB_AUTH_THROTTLE_ENABLED", "0")
+
+import httpx
+
+from auth_utils import create_access_token, password_executor
+from database import init_db
+from loadgen import percentile
+from main import app
+
+
+async def quiz_loop(client, headers, deadline, latencies):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        res = await client.get("/api/quiz/random?count=10", headers=headers)
+        latencies.append(time.perf_counter() - start)
+
+        question = res.json()["questions"][0]
+        start = time.perf_counter()
+        await client.post(
+            "/api/quiz/check",
+            headers=headers,
+            json={"term_id": question["id"], "user_answer": "guess"}
+        )
+        latencies.append(time.perf_counter() - start)
+
+
+async def login_loop(client, deadline, results):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        res = await client.post(
+            "/api/auth/login",
+            data={"username": "user", "password": "user123"}
+        )
+        results.append((res.status_code, time.perf_counter() - start))
+        if res.status_code == 503:
+            await asyncio.sleep(0.05)
+
+
+async def run_phase(client, args, with_logins):
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'user'})}"}
+    deadline = time.perf_counter() + args.seconds
+    quiz_latencies, login_results = [], []
+
+    tasks = [quiz_loop(client, headers, deadline, quiz_latencies) for _ in range(args.quiz_clients)]
+    if with_logins:
+        tasks += [login_loop(client, deadline, login_results) for _ in range(args.logins)]
+    await asyncio.gather(*tasks)
+    return quiz_latencies, login_results
+
+
+def report(label, quiz_latencies, login_results, seconds):
+    print(f"\n{label}")
+    print("-" * 60)
+    print(
+        f"quiz requests: {len(quiz_latencies):6d}  "
+        f"p50 {percentile(quiz_latencies, 50) * 1000:7.2f} ms  "
+        f"p99 {percentile(quiz_latencies, 99) * 1000:7.2f} ms"
+    )
+    if login_results:
+        ok = [lat for code, lat in login_results if code == 200]
+        shed = sum(1 for code, _ in login_results if code == 503)
+        print(
+            f"logins ok:     {len(ok):6d}  "
+            f"{len(ok) / seconds:7.2f} /s   "
+            f"p99 {percentile(ok, 99) * 1000:7.2f} ms   503s: {shed}"
+        )
+
+
+async def main(args):
+    init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        report("quiz only", *await run_phase(client, args, with_logins=False), args.seconds)
+        report(
+            f"quiz + {args.logins} concurrent logins",
+            *await run_phase(client, args, with_logins=True),
+            args.seconds
+        )
+    print(f"\npassword executor: {password_executor.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=16)
+    parser.add_argument("--quiz-clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,79 @@
+"""Leaderboard updates: sorted key list vs. the Fenwick-tree RankedBoard.
+
+For each size a board is loaded with that many users and random scores,
+then ``--updates`` random score changes are applied, each followed by a
+rank lookup. The sorted list (the previous RankedBoard) pays an O(n)
+delete + insort per update; the Fenwick tree pays O(log max_points).
+Ranks and top-10 results are checked to agree. Run from backend/:
+
+    python benchmarks/bench_leaderboard.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from bisect import bisect_left, insort
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leaderboard import RankedBoard
+
+
+class SortedListBoard:
+    """A sorted (-points, -best, user_id) list, as RankedBoard used to keep"""
+
+    def __init__(self, rows):
+        self.totals = {}
+        self._order = []
+        for user_id, points, best, quizzes in rows:
+            self.totals[user_id] = (points, best, quizzes)
+            self._order.append((-points, -best, user_id))
+        self._order.sort()
+
+    def set(self, user_id, points, best, quizzes):
+        old = self.totals.get(user_id)
+        if old is not None:
+            del self._order[bisect_left(self._order, (-old[0], -old[1], user_id))]
+        self.totals[user_id] = (points, best, quizzes)
+        insort(self._order, (-points, -best, user_id))
+
+    def rank(self, user_id):
+        return bisect_left(self._order, (-self.totals[user_id][0],)) + 1
+
+    def top(self, n):
+        return [(self.rank(user_id), user_id) for _, _, user_id in self._order[:n]]
+
+
+def timed(board, updates):
+    started = time.perf_counter()
+    for user_id, points, best in updates:
+        board.set(user_id, points, best, 1)
+        board.rank(user_id)
+    return (time.perf_counter() - started) / len(updates) * 1e6
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    print(f"{'USERS':>9}  {'SORTED LIST':>12} {'FENWICK':>10} {'SPEEDUP':>8}")
+    print("-" * 44)
+    for n in args.sizes:
+        rows = [(u, rng.randint(0, args.max_points), float(rng.randint(0, 100)), 1) for u in range(n)]
+        updates = [
+            (rng.randrange(n), rng.randint(0, args.max_points), float(rng.randint(0, 100)))
+            for _ in range(args.updates)
+        ]
+        baseline, board = SortedListBoard(rows), RankedBoard("bench", rows)
+        list_us, tree_us = timed(baseline, updates), timed(board, updates)
+        assert baseline.top(10) == board.top(10), f"top 10 differs at {n} users"
+        assert all(baseline.rank(u) == board.rank(u) for u, _, _ in updates[:1000])
+        print(f"{n:>9}  {list_us:>10.1f}us {tree_us:>8.1f}us {list_us / tree_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--max-points", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=1)
+    main(parser.parse_args())
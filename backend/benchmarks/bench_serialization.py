@@ -0,0 +1,103 @@
+"""List endpoint serialization: per-row response models vs. the fast path.
+
+For each size a fresh database gets that many users, scores and terms;
+then /api/admin/scores/all, /api/admin/users and the /api/terms body build
+are timed with ``fast_json_responses`` off and on. Bodies are checked to
+be identical. Run from backend/:
+
+    python benchmarks/bench_serialization.py --sizes 1000 10000 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["TECH_VOCAB_DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+os.environ["TECH_VOCAB_METRICS_ENABLED"] = "0"
+
+from fastapi.testclient import TestClient
+
+import fast_json
+import term_cache
+from auth_utils import create_access_token
+from config import settings
+from database import Base, SessionLocal, engine
+from http_cache import catalog_body
+from main import app
+from models import Term, User, UserScore
+
+
+def seed(n):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com",
+             "hashed_password": "x", "is_admin": i == 1, "created_at": start + timedelta(seconds=i)}
+            for i in range(1, n + 1)
+        ])
+        conn.execute(UserScore.__table__.insert(), [
+            {"user_id": 1 + i % n, "correct": i % 10, "total": 10, "percentage": (i % 10) * 10.0,
+             "created_at": start + timedelta(seconds=i)}
+            for i in range(n)
+        ])
+        conn.execute(Term.__table__.insert(), [
+            {"term": f"Term {i}", "definition": "A definition " * 8, "example": "example()",
+             "real_world": "Used somewhere real " * 4, "difficulty": ("easy", "medium", "hard")[i % 3],
+             "created_at": start, "updated_at": start}
+            for i in range(n)
+        ])
+    term_cache.invalidate()
+
+
+def timed(fn, repeat):
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, result
+
+
+def build_catalog_body():
+    db = SessionLocal()
+    try:
+        term_cache.invalidate()
+        return catalog_body(term_cache.get_catalog(db)).body
+    finally:
+        db.close()
+
+
+def main(args):
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'user1'})}"}
+    cases = [
+        ("GET /api/admin/scores/all", lambda: client.get("/api/admin/scores/all", headers=headers).content),
+        ("GET /api/admin/users", lambda: client.get("/api/admin/users", headers=headers).content),
+        ("/api/terms body build", build_catalog_body),
+    ]
+    encoder = "orjson" if fast_json.orjson is not None else "pydantic-core"
+    print(f"fast path encoder: {encoder}\n")
+    print(f"{'ROWS':>7}  {'CASE':<28} {'MODELS':>10} {'FAST':>10} {'SPEEDUP':>8}")
+    print("-" * 68)
+    for n in args.sizes:
+        seed(n)
+        for label, fn in cases:
+            settings.fast_json_responses = False
+            slow_ms, slow_body = timed(fn, args.repeat)
+            settings.fast_json_responses = True
+            fast_ms, fast_body = timed(fn, args.repeat)
+            assert slow_body == fast_body, f"{label}: bodies differ at {n} rows"
+            print(f"{n:>7}  {label:<28} {slow_ms:>8.1f}ms {fast_ms:>8.1f}ms {slow_ms / fast_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,107 @@
+"""Concurrent score writes + history reads: default SQLite vs. tuned engine.
+
+Each configuration gets a fresh database file. Writer threads insert
+UserScore rows, one transaction each and without retries so lock errors
+are counted, while reader threads page through score history. Run from backend/:
+
+    python benchmarks/bench_storage.py --writers 8 --readers 8 --seconds 5
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from config import Settings
+from database import Base, make_engine
+from models import User, UserScore
+
+CONFIGS = {
+    "sqlite defaults (rollback journal, synchronous=full, 5s timeout)": dict(
+        sqlite_journal_mode="delete",
+        sqlite_synchronous="full",
+        sqlite_cache_size_kb=2_000,
+        sqlite_mmap_size=0,
+    ),
+    "tuned (WAL, synchronous=normal, cache + mmap, separate read engine)": dict(),
+}
+
+
+def run(label, overrides, args):
+    cfg = Settings(**overrides)
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    url = f"sqlite:///{path}"
+
+    writer = make_engine(url, cfg)
+    Base.metadata.create_all(bind=writer)
+    separate_reader = not overrides
+    reader = make_engine(url, cfg, read_only=True) if separate_reader else writer
+    WriteSession = sessionmaker(bind=writer)
+    ReadSession = sessionmaker(bind=reader)
+
+    with WriteSession() as db:
+        db.add(User(id=1, username="bench", email="bench@example.com", hashed_password="x"))
+        db.commit()
+
+    counts = {"writes": 0, "reads": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def write_loop():
+        while time.perf_counter() < deadline:
+            with WriteSession() as db:
+                try:
+                    db.add(UserScore(user_id=1, correct=7, total=10, percentage=70.0))
+                    db.commit()
+                    bump("writes")
+                except OperationalError:
+                    db.rollback()
+                    bump("errors")
+
+    def read_loop():
+        while time.perf_counter() < deadline:
+            with ReadSession() as db:
+                try:
+                    db.query(UserScore).filter(UserScore.user_id == 1).order_by(
+                        UserScore.created_at.desc()
+                    ).limit(20).all()
+                    bump("reads")
+                except OperationalError:
+                    bump("errors")
+
+    threads = [threading.Thread(target=write_loop) for _ in range(args.writers)]
+    threads += [threading.Thread(target=read_loop) for _ in range(args.readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    writer.dispose()
+    reader.dispose()
+    print(f"\n{label}")
+    print("-" * 72)
+    print(
+        f"writes/s {counts['writes'] / args.seconds:9.1f}   "
+        f"reads/s {counts['reads'] / args.seconds:9.1f}   "
+        f"lock errors {counts['errors']}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    for label, overrides in CONFIGS.items():
+        run(label, overrides, args)
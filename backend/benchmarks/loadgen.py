@@ -0,0 +1,244 @@
+"""HTTP load generator replaying realistic quiz sessions.
+
+Each virtual user loops over: login -> quiz/random -> N x quiz/check ->
+scores. Requests go either to the ASGI app in-process or to a running
+server, and per-route throughput and p50/p95/p99 latencies are printed and
+stored in tests/test_results.db (tables ``load_runs``/``load_run_routes``)
+so builds can be compared. Run from backend/:
+
+    python benchmarks/loadgen.py --users 20 --seconds 30 --label my-branch
+    python benchmarks/loadgen.py --target http://127.0.0.1:8000 --users 50
+    python benchmarks/loadgen.py --history
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+
+RESULTS_DB = os.path.join(BACKEND_DIR, "tests", "test_results.db")
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+# ================= RECORDING =================
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def request(self, client, route, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[route].append(time.perf_counter() - start)
+            self.errors[route] += 1
+            return None
+        self.latencies[route].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[route] += 1
+            return None
+        return response
+
+    def summary(self, seconds):
+        rows = []
+        for route in sorted(self.latencies):
+            samples = self.latencies[route]
+            rows.append({
+                "route": route,
+                "count": len(samples),
+                "errors": self.errors[route],
+                "rps": len(samples) / seconds,
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000,
+                "max_ms": max(samples) * 1000,
+            })
+        return rows
+
+# ================= USER FLOW =================
+
+async def user_session(client, recorder, args, deadline):
+    while time.perf_counter() < deadline:
+        res = await recorder.request(
+            client, "POST /api/auth/login", "POST", "/api/auth/login",
+            data={"username": args.username, "password": args.password}
+        )
+        if res is None:
+            await asyncio.sleep(0.1)
+            continue
+        headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+        for _ in range(args.quizzes_per_login):
+            if time.perf_counter() >= deadline:
+                return
+            res = await recorder.request(
+                client, "GET /api/quiz/random", "GET", "/api/quiz/random",
+                params={"count": args.questions}, headers=headers
+            )
+            if res is None:
+                continue
+            questions = res.json()["questions"]
+
+            correct = 0
+            for question in questions:
+                res = await recorder.request(
+                    client, "POST /api/quiz/check", "POST", "/api/quiz/check",
+                    headers=headers,
+                    json={"term_id": question["id"], "user_answer": random.choice(["API", "Docker", "?"])}
+                )
+                if res is not None and res.json()["correct"]:
+                    correct += 1
+
+            await recorder.request(
+                client, "POST /api/scores", "POST", "/api/scores",
+                headers=headers, json={"correct": correct, "total": len(questions)}
+            )
+
+
+def make_client(target):
+    if target == "inprocess":
+        # Every virtual user logs in as the same account; the login
+        # throttle would reject most of that traffic
+        os.environ.setdefault("TECH_VOCAB_AUTH_THROTTLE_ENABLED", "0")
+        from database import init_db
+        from main import app
+
+        init_db()
+        transport = httpx.ASGITransport(app=app)
+        return httpx.AsyncClient(transport=transport, base_url="http://loadgen", timeout=60)
+    return httpx.AsyncClient(base_url=target, timeout=60)
+
+
+async def run(args):
+    async with make_client(args.target) as client:
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = started + args.seconds
+        await asyncio.gather(*(user_session(client, recorder, args, deadline) for _ in range(args.users)))
+        return recorder, time.perf_counter() - started
+
+# ================= RESULTS DB =================
+
+def store_run(args, rows, elapsed):
+    conn = sqlite3.connect(args.results_db)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS load_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            label TEXT,
+            target TEXT,
+            users INTEGER,
+            duration_s REAL,
+            total_requests INTEGER,
+            throughput_rps REAL,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE IF NOT EXISTS load_run_routes (
+            run_id INTEGER REFERENCES load_runs(id),
+            route TEXT,
+            count INTEGER,
+            errors INTEGER,
+            rps REAL,
+            p50_ms REAL,
+            p95_ms REAL,
+            p99_ms REAL,
+            max_ms REAL
+        );
+    """)
+    total = sum(r["count"] for r in rows)
+    cur = conn.execute(
+        """
+        INSERT INTO load_runs (label, target, users, duration_s, total_requests, throughput_rps)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (args.label, args.target, args.users, elapsed, total, total / elapsed)
+    )
+    conn.executemany(
+        """
+        INSERT INTO load_run_routes
+        (run_id, route, count, errors, rps, p50_ms, p95_ms, p99_ms, max_ms)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (cur.lastrowid, r["route"], r["count"], r["errors"], r["rps"],
+             r["p50_ms"], r["p95_ms"], r["p99_ms"], r["max_ms"])
+            for r in rows
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return cur.lastrowid
+
+
+def print_history(results_db, limit=10):
+    conn = sqlite3.connect(results_db)
+    try:
+        runs = conn.execute(
+            """
+            SELECT id, label, target, users, total_requests, throughput_rps, timestamp
+            FROM load_runs ORDER BY id DESC LIMIT ?
+            """,
+            (limit,)
+        ).fetchall()
+    except sqlite3.OperationalError:
+        runs = []
+    print(f"\n{'ID':<4} {'LABEL':<20} {'TARGET':<24} {'USERS':<6} {'REQS':<7} {'RPS':<8} TIMESTAMP")
+    print("-" * 90)
+    for r in runs:
+        print(f"{r[0]:<4} {str(r[1]):<20} {r[2]:<24} {r[3]:<6} {r[4]:<7} {r[5]:<8.1f} {r[6]}")
+    conn.close()
+
+
+def print_report(rows, elapsed):
+    total = sum(r["count"] for r in rows)
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+    print(f"{'ROUTE':<24} {'COUNT':>7} {'ERR':>5} {'RPS':>8} {'P50':>8} {'P95':>8} {'P99':>8} {'MAX':>8}")
+    print("-" * 84)
+    for r in rows:
+        print(
+            f"{r['route']:<24} {r['count']:>7} {r['errors']:>5} {r['rps']:>8.1f} "
+            f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['max_ms']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay quiz sessions against the API")
+    parser.add_argument("--target", default="inprocess", help="'inprocess' or a base URL such as http://127.0.0.1:8000")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--questions", type=int, default=10, help="questions per quiz")
+    parser.add_argument("--quizzes-per-login", type=int, default=1)
+    parser.add_argument("--username", default="user")
+    parser.add_argument("--password", default="user123")
+    parser.add_argument("--label", default=datetime.now().strftime("run-%Y%m%d-%H%M%S"))
+    parser.add_argument("--results-db", default=RESULTS_DB)
+    parser.add_argument("--no-store", action="store_true", help="do not record the run")
+    parser.add_argument("--history", action="store_true", help="list recent runs and exit")
+    args = parser.parse_args()
+
+    if args.history:
+        print_history(args.results_db)
+        sys.exit(0)
+
+    recorder, elapsed = asyncio.run(run(args))
+    rows = recorder.summary(elapsed)
+    print_report(rows, elapsed)
+    if not args.no_store:
+        run_id = store_run(args, rows, elapsed)
+        print(f"\nStored as run {run_id} ({args.label}) in {args.results_db}")
@@ -0,0 +1,111 @@
+"""Runtime settings, overridable through TECH_VOCAB_* environment variables or a .env file."""
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="TECH_VOCAB_", env_file=".env", extra="ignore")
+
+    # ================= STORAGE =================
+    database_url: str = "sqlite:///./tech_vocab.db"
+    # GET routes read through this URL; defaults to database_url
+    read_database_url: Optional[str] = None
+
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_cache_size_kb: int = 64_000
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_busy_timeout_ms: int = 5_000
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    read_pool_size: int = 10
+    read_max_overflow: int = 20
+
+    db_write_retries: int = 3
+    db_retry_backoff_ms: int = 50
+
+    # Serve the API from async routes on an AsyncEngine (needs aiosqlite/asyncpg).
+    # The async URLs default to database_url/read_database_url with the async driver.
+    db_async: bool = False
+    async_database_url: Optional[str] = None
+    async_read_database_url: Optional[str] = None
+
+    # ================= TERM CATALOG =================
+    # Directory for the memory-mapped catalog snapshot shared by all worker
+    # processes; unset keeps a private in-process catalog per worker
+    term_snapshot_dir: Optional[str] = None
+
+    # ================= RESPONSES =================
+    # Encode list endpoints straight from column tuples (orjson when installed)
+    # instead of validating one response model per row
+    fast_json_responses: bool = False
+
+    # ================= SCORE WRITES =================
+    # direct: one transaction per score (default)
+    # group: batched commits, the response waits for its batch (durable ack)
+    # write_behind: batched commits, 202 right away (a crash loses up to max_delay of scores)
+    score_write_mode: str = "direct"
+    score_queue_max_batch: int = 200
+    score_queue_max_delay_ms: int = 20
+    score_queue_max_pending: int = 10_000
+    score_queue_shutdown_timeout_seconds: float = 10
+    # In group mode a request gives up with 503 after max_delay plus this long
+    score_queue_wait_margin_seconds: float = 5
+
+    # ================= ANSWER ANALYTICS =================
+    answer_queue_max_batch: int = 500
+    answer_queue_max_delay_ms: int = 200
+    answer_queue_max_pending: int = 50_000
+    # Shutdown waits this long for queued events and the final compaction
+    answer_queue_shutdown_timeout_seconds: float = 10
+    # 0 disables the background compactor (run ``python answer_log.py`` instead)
+    answer_compaction_interval_seconds: float = 60
+    # Fewer attempts than this and no difficulty is suggested
+    analytics_min_attempts: int = 20
+
+    # ================= METRICS =================
+    metrics_enabled: bool = True
+    slow_query_ms: float = 100
+    slow_query_samples: int = 50
+
+    # ================= PROFILING =================
+    # Admins can profile a single request with ?profile=1 or an X-Profile: 1 header
+    profiling_enabled: bool = False
+    # Fraction of flagged requests that are actually profiled
+    profile_sample_rate: float = 1.0
+    profile_interval_ms: float = 2
+    profile_dir: str = "./profiles"
+    profile_keep: int = 50
+
+    # ================= LEADERBOARD =================
+    # Each worker reloads its in-memory boards this often to pick up other workers' writes
+    leaderboard_refresh_seconds: int = 60
+
+    # ================= AUTH =================
+    principal_cache_size: int = 10_000
+    principal_cache_ttl_seconds: int = 300
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
+
+    # Login/register throttling, checked before any password hashing
+    auth_throttle_enabled: bool = True
+    # Shared by every worker on the host; holds failed logins only.
+    # Defaults to auth_throttle.db next to the SQLite database_url file.
+    auth_throttle_db: Optional[str] = None
+    # Only enable behind a proxy that sets X-Forwarded-For itself
+    trust_forwarded_for: bool = False
+    throttle_max_keys: int = 100_000
+    login_ip_per_minute: float = 30
+    login_ip_burst: int = 10
+    login_user_per_minute: float = 10
+    login_user_burst: int = 5
+    register_ip_per_minute: float = 5
+    register_ip_burst: int = 5
+    login_failure_window_seconds: int = 15 * 60
+    login_max_failures_per_ip: int = 50
+    login_max_failures_per_user: int = 10
+
+
+settings = Settings()
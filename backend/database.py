@@ -1,14 +1,75 @@
-from sqlalchemy import create_engine
+import asyncio
+import time
+from typing import Callable, Dict, TypeVar
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config import Settings, settings
+
+T = TypeVar("T")
+
+def _sqlite_pragmas(cfg: Settings, read_only: bool):
+    pragmas = [
+        f"PRAGMA busy_timeout = {cfg.sqlite_busy_timeout_ms}",
+        f"PRAGMA synchronous = {cfg.sqlite_synchronous}",
+        f"PRAGMA cache_size = -{cfg.sqlite_cache_size_kb}",
+        f"PRAGMA mmap_size = {cfg.sqlite_mmap_size}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only = ON")
+    else:
+        pragmas.insert(0, f"PRAGMA journal_mode = {cfg.sqlite_journal_mode}")
+    return pragmas
+
+def _pool_kwargs(url: str, cfg: Settings, read_only: bool) -> dict:
+    if url.startswith("sqlite") and (":memory:" in url or url.split("://", 1)[1] == ""):
+        return {}
+    return {
+        "pool_size": cfg.read_pool_size if read_only else cfg.db_pool_size,
+        "max_overflow": cfg.read_max_overflow if read_only else cfg.db_max_overflow,
+    }
+
+def _install_pragmas(sync_engine: Engine, cfg: Settings, read_only: bool) -> None:
+    pragmas = _sqlite_pragmas(cfg, read_only)
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./tech_vocab.db"
+    @event.listens_for(sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def make_engine(url: str, cfg: Settings = settings, read_only: bool = False) -> Engine:
+    """Build an engine; SQLite connections get the configured pragmas on connect"""
+    if not url.startswith("sqlite"):
+        return create_engine(url, **_pool_kwargs(url, cfg, read_only))
+
+    new_engine = create_engine(
+        url,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": cfg.sqlite_busy_timeout_ms / 1000,
+        },
+        **_pool_kwargs(url, cfg, read_only)
+    )
+    _install_pragmas(new_engine, cfg, read_only)
+    return new_engine
+
+SQLALCHEMY_DATABASE_URL = settings.database_url
+
+engine = make_engine(SQLALCHEMY_DATABASE_URL)
+read_engine = make_engine(settings.read_database_url or SQLALCHEMY_DATABASE_URL, read_only=True)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
@@ -20,13 +81,164 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    """Dependency to get a session on the read-only engine (GET routes)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _is_locked(exc: OperationalError) -> bool:
+    message = str(exc.orig).lower()
+    return "database is locked" in message or "database is busy" in message
+
+def run_write(db: Session, apply: Callable[[Session], T]) -> T:
+    """Run apply(db) and commit, retrying with backoff while SQLite is locked.
+
+    apply must be safe to re-run: on a retry the session has been rolled
+    back and every pending object discarded.
+    """
+    for attempt in range(settings.db_write_retries + 1):
+        try:
+            result = apply(db)
+            db.commit()
+            return result
+        except OperationalError as exc:
+            db.rollback()
+            if not _is_locked(exc) or attempt == settings.db_write_retries:
+                raise
+            time.sleep(settings.db_retry_backoff_ms / 1000 * 2 ** attempt)
+
+# ================= ASYNC =================
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+def async_url(url: str) -> str:
+    """Swap a sync driver for its asyncio counterpart (sqlite -> aiosqlite)"""
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme.split('+')[0], scheme)}://{rest}"
+
+def make_async_engine(url: str, cfg: Settings = settings, read_only: bool = False) -> AsyncEngine:
+    """AsyncEngine counterpart of make_engine; same pools and pragmas"""
+    url = async_url(url)
+    if not url.startswith("sqlite"):
+        return create_async_engine(url, **_pool_kwargs(url, cfg, read_only))
+
+    pool_kwargs = _pool_kwargs(url, cfg, read_only)
+    if pool_kwargs:
+        # aiosqlite defaults to NullPool; keep connections (and their pragmas) around
+        pool_kwargs["poolclass"] = AsyncAdaptedQueuePool
+    new_engine = create_async_engine(
+        url,
+        connect_args={"timeout": cfg.sqlite_busy_timeout_ms / 1000},
+        **pool_kwargs
+    )
+    _install_pragmas(new_engine.sync_engine, cfg, read_only)
+    return new_engine
+
+# Built on first use so the sync-only setup never imports an async driver
+_async_sessions: Dict[bool, async_sessionmaker] = {}
+
+def get_async_engine(read_only: bool = False) -> AsyncEngine:
+    return _async_sessionmaker(read_only).kw["bind"]
+
+def _async_sessionmaker(read_only: bool) -> async_sessionmaker:
+    factory = _async_sessions.get(read_only)
+    if factory is None:
+        if read_only:
+            url = (settings.async_read_database_url or settings.read_database_url
+                   or settings.async_database_url or SQLALCHEMY_DATABASE_URL)
+        else:
+            url = settings.async_database_url or SQLALCHEMY_DATABASE_URL
+        factory = _async_sessions[read_only] = async_sessionmaker(
+            bind=make_async_engine(url, read_only=read_only),
+            autoflush=False,
+            expire_on_commit=False
+        )
+    return factory
+
+async def get_async_db():
+    """Dependency to get an AsyncSession"""
+    async with _async_sessionmaker(False)() as db:
+        yield db
+
+async def get_async_read_db():
+    """Dependency to get an AsyncSession on the read-only engine (GET routes)"""
+    async with _async_sessionmaker(True)() as db:
+        yield db
+
+async def run_write_async(db: AsyncSession, apply: Callable[[Session], T]) -> T:
+    """run_write for AsyncSession: apply gets the underlying sync Session
+    (so the sync helpers are reused as-is) and runs via run_sync"""
+    for attempt in range(settings.db_write_retries + 1):
+        try:
+            result = await db.run_sync(apply)
+            await db.commit()
+            return result
+        except OperationalError as exc:
+            await db.rollback()
+            if not _is_locked(exc) or attempt == settings.db_write_retries:
+                raise
+            await asyncio.sleep(settings.db_retry_backoff_ms / 1000 * 2 ** attempt)
+
+async def dispose_async_engines() -> None:
+    for factory in _async_sessions.values():
+        await factory.kw["bind"].dispose()
+    _async_sessions.clear()
+
+def upsert_insert(bind):
+    """Dialect insert() that supports on_conflict_do_update"""
+    if bind.dialect.name == "sqlite":
+        return sqlite_insert
+    if bind.dialect.name == "postgresql":
+        return postgresql_insert
+    raise RuntimeError(f"Upserts are not supported on {bind.dialect.name}")
+
+def greatest(bind, *values):
+    """Row-wise maximum for upsert SET clauses; SQLite spells it max(a, b)"""
+    if bind.dialect.name == "sqlite":
+        return func.max(*values)
+    return func.greatest(*values)
+
+# ================= COMMIT HOOKS =================
+
+def on_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run callback once db's current transaction commits; dropped on rollback.
+
+    Use it to update in-process structures that must never see data the
+    database does not have.
+    """
+    db.info.setdefault("on_commit", []).append(callback)
+
+@event.listens_for(Session, "after_commit")
+def _run_commit_hooks(session):
+    for callback in session.info.pop("on_commit", ()):
+        callback()
+
+@event.listens_for(Session, "after_rollback")
+def _drop_commit_hooks(session):
+    session.info.pop("on_commit", None)
+
+def ensure_indexes():
+    """Create indexes added to models after their table already existed"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
 def init_db():
     """Initialize database with sample data"""
     from models import User, Term
     # UserScore
     from auth_utils import get_password_hash
+    from stats import ensure_summary
+    from search import ensure_search_index
+    from leaderboard import ensure_leaderboard
+    from progress import ensure_progress
     
     Base.metadata.create_all(bind=engine)
+    ensure_indexes()
+    ensure_search_index(engine)
     
     db = SessionLocal()
     
@@ -148,4 +360,9 @@ def init_db():
         print("📝 Admin credentials - username: admin, password: admin123")
         print("📝 User credentials - username: user, password: user123")
     
+    # Make sure /api/stats has a summary row to read from
+    ensure_summary(db)
+    ensure_leaderboard(db)
+    ensure_progress(db)
+    
     db.close()
\ No newline at end of file
@@ -0,0 +1,57 @@
+"""Dedicated, size-limited thread pools for CPU-heavy work.
+
+Work that would otherwise hog FastAPI's shared threadpool (e.g. bcrypt)
+is submitted here instead. Each executor admits at most
+``max_workers + max_pending`` jobs; anything beyond that is rejected
+immediately with ``ExecutorSaturated`` so callers can shed load.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorSaturated(Exception):
+    """Raised when a BoundedExecutor has no free slot"""
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.submitted = 0
+        self.rejected = 0
+        self._capacity = max_workers + max_pending
+        self._slots = threading.BoundedSemaphore(self._capacity)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+
+    async def run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise ExecutorSaturated(self.name)
+
+        try:
+            future = self._pool.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.submitted += 1
+        # Release on completion, not on await: a cancelled request must
+        # keep holding its slot until the thread is actually free.
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    def in_flight(self) -> int:
+        return self._capacity - self._slots._value
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight(),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
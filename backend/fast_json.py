@@ -0,0 +1,50 @@
+"""Column-tuple JSON encoding for large list responses.
+
+The default list path loads ORM objects and lets FastAPI validate each one
+against its response schema before serializing. With
+``settings.fast_json_responses`` enabled, list endpoints select only the
+schema's columns and encode the rows directly, skipping per-row model
+construction. The JSON shape is unchanged: the same keys in the same order,
+and datetimes as ISO 8601 strings.
+
+orjson is used when installed; pydantic-core's encoder is the fallback.
+"""
+from typing import Dict, Iterable, List, Sequence, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+_columns: Dict[Tuple[type, type], Tuple[List[str], list]] = {}
+
+
+def dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return to_json(value)
+
+
+def schema_columns(schema: Type[BaseModel], model) -> Tuple[List[str], list]:
+    """(field names, model columns) for every field of schema, in order"""
+    cached = _columns.get((schema, model))
+    if cached is None:
+        fields = list(schema.model_fields)
+        cached = _columns[(schema, model)] = (fields, [getattr(model, f) for f in fields])
+    return cached
+
+
+def encode_rows(fields: Sequence[str], rows: Iterable[tuple]) -> bytes:
+    return dumps([dict(zip(fields, row)) for row in rows])
+
+
+def encode_objects(fields: Sequence[str], objects: Iterable) -> bytes:
+    return dumps([{f: getattr(obj, f) for f in fields} for obj in objects])
+
+
+def json_response(body: bytes, headers: Dict[str, str] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,131 @@
+"""Conditional GET and pre-compressed bodies for catalog responses.
+
+A ``CachedBody`` holds the serialized JSON for one catalog snapshot, its
+strong ETag (a content hash, so it survives restarts and is identical
+across workers) and lazily built gzip/brotli encodings. Bodies are memoized
+on the catalog snapshot, so an unchanged catalog is serialized and
+compressed once, and a matching ``If-None-Match`` is answered with 304
+without touching the ORM.
+"""
+import gzip
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, List, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+import schemas
+from config import settings
+import fast_json
+from term_cache import TermCatalog
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+
+_terms_adapter = TypeAdapter(List[schemas.TermResponse])
+
+
+class CachedBody:
+    __slots__ = ("body", "digest", "last_modified", "_encoded")
+
+    def __init__(self, body: bytes, last_modified: Optional[datetime]):
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.last_modified = last_modified
+        self._encoded: Dict[str, bytes] = {}
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        # Each content-coding is a distinct representation, so it gets its own strong tag
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def encoded(self, encoding: str) -> bytes:
+        data = self._encoded.get(encoding)
+        if data is None:
+            if encoding == "br":
+                data = brotli.compress(self.body)
+            else:
+                data = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+            self._encoded[encoding] = data
+        return data
+
+
+def _build_catalog_body(catalog: TermCatalog) -> CachedBody:
+    last_modified = max((t.updated_at for t in catalog.terms if t.updated_at), default=None)
+    if settings.fast_json_responses:
+        fields = list(schemas.TermResponse.model_fields)
+        return CachedBody(fast_json.encode_objects(fields, catalog.terms), last_modified)
+    terms = _terms_adapter.validate_python(catalog.terms, from_attributes=True)
+    return CachedBody(_terms_adapter.dump_json(terms), last_modified)
+
+
+def catalog_body(catalog: TermCatalog) -> CachedBody:
+    return catalog.derived("terms_body", _build_catalog_body)
+
+
+def term_body(catalog: TermCatalog, term_id: int) -> Optional[CachedBody]:
+    bodies = catalog.derived("term_bodies", lambda _: {})
+    cached = bodies.get(term_id)
+    if cached is None:
+        term = catalog.get(term_id)
+        if term is None:
+            return None
+        model = schemas.TermResponse.model_validate(term)
+        cached = bodies[term_id] = CachedBody(model.model_dump_json().encode(), term.updated_at)
+    return cached
+
+
+def _negotiate(accept_encoding: str) -> Optional[str]:
+    offered = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+    if brotli is not None and "br" in offered:
+        return "br"
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
+def _response_encoding(cached: CachedBody, accept_encoding: str) -> Optional[str]:
+    if len(cached.body) < MIN_COMPRESS_SIZE:
+        return None
+    return _negotiate(accept_encoding)
+
+
+def prepare_encoding(cached: CachedBody, accept_encoding: str) -> CachedBody:
+    """Compress the variant cached_json_response will serve, so async routes can do it in the threadpool"""
+    encoding = _response_encoding(cached, accept_encoding)
+    if encoding:
+        cached.encoded(encoding)
+    return cached
+
+
+def cached_json_response(request: Request, cached: CachedBody) -> Response:
+    encoding = _response_encoding(cached, request.headers.get("accept-encoding", ""))
+
+    headers = {
+        "ETag": cached.etag(encoding),
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding, Authorization",
+    }
+    if cached.last_modified:
+        # Informational only: deletes don't move max(updated_at), so
+        # If-Modified-Since is not trusted for 304s; the ETag is.
+        headers["Last-Modified"] = format_datetime(
+            cached.last_modified.replace(tzinfo=timezone.utc), usegmt=True
+        )
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags or tags & {cached.etag(), cached.etag("gzip"), cached.etag("br")}:
+            return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+        return Response(cached.encoded(encoding), media_type="application/json", headers=headers)
+    return Response(cached.body, media_type="application/json", headers=headers)
@@ -0,0 +1,298 @@
+"""Leaderboards with incrementally maintained rankings.
+
+``record_score`` upserts the user's row in ``leaderboard_entries`` for the
+all-time window and the current ISO week, inside the score's transaction.
+Each worker keeps a ``RankedBoard`` per window: a Fenwick tree over points
+for O(log max_points) updates and rank lookups, plus a dict of current
+totals. Boards are loaded from the table on first use or at startup,
+updated after each commit with the totals the upsert returned, and
+reloaded periodically so workers converge on each other's writes.
+
+Users are ranked by points (correct answers in the window), then best
+percentage; users with equal points share a rank ("1, 2, 2, 4").
+"""
+import threading
+import time
+from heapq import nsmallest
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from database import ReadSessionLocal, greatest, on_commit, upsert_insert
+from models import LeaderboardEntry, User, UserScore
+
+ALL_TIME = "all"
+WEEKLY = "weekly"
+PERIODS = (ALL_TIME, WEEKLY)
+# Fenwick slots a RankedBoard starts with; it doubles when a score passes the end
+MIN_TREE_SIZE = 1024
+
+
+def week_key(moment: datetime) -> str:
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def period_key(period: str, now: Optional[datetime] = None) -> str:
+    return ALL_TIME if period == ALL_TIME else week_key(now or datetime.utcnow())
+
+# ================= IN-MEMORY RANKING =================
+
+class RankedBoard:
+    """Ranks users by points with O(log max_points) updates and rank lookups.
+
+    A Fenwick tree indexed by points counts the users holding each score, and
+    ``_by_points`` keeps who they are for ``top``. The tree has one slot per
+    possible score, growing by doubling, so memory is O(max points + users).
+    """
+
+    def __init__(self, key: str, rows: Iterable[Tuple[int, int, float, int]]):
+        self.key = key
+        self.loaded_at = time.monotonic()
+        self.totals: Dict[int, Tuple[int, float, int]] = {}
+        self._by_points: Dict[int, Set[int]] = {}
+        self._lock = threading.Lock()
+        for user_id, points, best, quizzes in rows:
+            self.totals[user_id] = (points, best, quizzes)
+            self._by_points.setdefault(points, set()).add(user_id)
+        self._rebuild(max(self._by_points, default=0))
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    # Fenwick slot i + 1 holds points value i; points are never negative
+
+    def _rebuild(self, max_points: int) -> None:
+        size = MIN_TREE_SIZE
+        while size <= max_points:
+            size *= 2
+        tree = [0] * (size + 1)
+        for points, users in self._by_points.items():
+            tree[points + 1] = len(users)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _add(self, points: int, delta: int) -> None:
+        i = points + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _at_most(self, points: int) -> int:
+        """Users with at most this many points"""
+        i, count = min(points + 1, len(self._tree) - 1), 0
+        while i:
+            count += self._tree[i]
+            i -= i & -i
+        return count
+
+    def _nth_lowest(self, n: int) -> int:
+        """Points of the n-th user counting up from the lowest score (1-based)"""
+        position, step = 0, (len(self._tree) - 1)
+        while step:
+            following = position + step
+            if following < len(self._tree) and self._tree[following] < n:
+                position = following
+                n -= self._tree[following]
+            step //= 2
+        return position
+
+    def set(self, user_id: int, points: int, best: float, quizzes: int) -> None:
+        with self._lock:
+            old = self.totals.get(user_id)
+            self.totals[user_id] = (points, best, quizzes)
+            if old is not None:
+                if old[0] == points:
+                    return
+                users = self._by_points[old[0]]
+                users.discard(user_id)
+                if not users:
+                    del self._by_points[old[0]]
+                self._add(old[0], -1)
+            self._by_points.setdefault(points, set()).add(user_id)
+            if points + 1 >= len(self._tree):
+                self._rebuild(points)  # already counts the user
+            else:
+                self._add(points, 1)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        with self._lock:
+            totals = self.totals.get(user_id)
+            if totals is None:
+                return None
+            # Everyone with strictly more points ranks above; equal points tie
+            return len(self.totals) - self._at_most(totals[0]) + 1
+
+    def top(self, n: int) -> List[Tuple[int, int]]:
+        """(rank, user_id) for the first n users"""
+        with self._lock:
+            result: List[Tuple[int, int]] = []
+            above = 0
+            while len(result) < n and above < len(self.totals):
+                points = self._nth_lowest(len(self.totals) - above)
+                users = self._by_points[points]
+                # Within a score, best percentage then user id decides the order
+                for user_id in nsmallest(n - len(result), users,
+                                         key=lambda u: (-self.totals[u][1], u)):
+                    result.append((above + 1, user_id))
+                above += len(users)
+            return result
+
+
+_boards: Dict[str, RankedBoard] = {}
+_boards_lock = threading.Lock()
+
+
+def _board_query(key: str):
+    return select(
+        LeaderboardEntry.user_id, LeaderboardEntry.points,
+        LeaderboardEntry.best_percentage, LeaderboardEntry.quizzes
+    ).where(LeaderboardEntry.period == key)
+
+
+def _load(key: str) -> RankedBoard:
+    db = ReadSessionLocal()
+    try:
+        return RankedBoard(key, db.execute(_board_query(key)).all())
+    finally:
+        db.close()
+
+
+def _cached_board(period: str, key: str) -> Optional[RankedBoard]:
+    board = _boards.get(period)
+    if (
+        board is None
+        or board.key != key
+        or time.monotonic() - board.loaded_at > settings.leaderboard_refresh_seconds
+    ):
+        return None
+    return board
+
+
+def _store(period: str, board: RankedBoard) -> RankedBoard:
+    with _boards_lock:
+        _boards[period] = board
+    return board
+
+
+def get_board(period: str) -> RankedBoard:
+    key = period_key(period)
+    board = _cached_board(period, key)
+    # An empty board is falsy (len 0), so test against None
+    return board if board is not None else _store(period, _load(key))
+
+
+async def get_board_async(period: str, db: AsyncSession) -> RankedBoard:
+    """get_board for the async stack: reads through db, sorts off the event loop"""
+    key = period_key(period)
+    board = _cached_board(period, key)
+    if board is None:
+        rows = (await db.execute(_board_query(key))).all()
+        board = _store(period, await run_in_threadpool(RankedBoard, key, rows))
+    return board
+
+
+def warm() -> None:
+    for period in PERIODS:
+        get_board(period)
+
+# ================= WRITES =================
+
+def record_score(db: Session, user_id: int, correct: int, percentage: float,
+                 now: Optional[datetime] = None) -> None:
+    """Stage the leaderboard upserts for one quiz (caller commits)"""
+    now = now or datetime.utcnow()
+    bind = db.get_bind()
+    insert = upsert_insert(bind)
+    table = LeaderboardEntry.__table__
+
+    for period in PERIODS:
+        key = period_key(period, now)
+        stmt = insert(table).values(
+            user_id=user_id, period=key, points=correct,
+            best_percentage=percentage, quizzes=1, updated_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.period],
+            set_={
+                "points": table.c.points + stmt.excluded.points,
+                "best_percentage": greatest(bind, table.c.best_percentage, stmt.excluded.best_percentage),
+                "quizzes": table.c.quizzes + 1,
+                "updated_at": now,
+            }
+        ).returning(table.c.points, table.c.best_percentage, table.c.quizzes)
+        points, best, quizzes = db.execute(stmt).one()
+
+        def publish(period=period, key=key, totals=(points, best, quizzes)):
+            board = _boards.get(period)
+            if board is not None and board.key == key:
+                board.set(user_id, *totals)
+
+        on_commit(db, publish)
+
+# ================= READS =================
+
+def standings(db: Session, period: str, limit: int, user_id: int,
+              board: Optional[RankedBoard] = None) -> dict:
+    if board is None:
+        board = get_board(period)
+    leaders = board.top(limit)
+    names = dict(db.query(User.id, User.username).filter(
+        User.id.in_([uid for _, uid in leaders] + [user_id])
+    ).all())
+
+    def entry(rank: int, uid: int) -> dict:
+        points, best, quizzes = board.totals[uid]
+        return {
+            "rank": rank,
+            "user_id": uid,
+            "username": names.get(uid),
+            "points": points,
+            "best_percentage": best,
+            "quizzes": quizzes,
+        }
+
+    my_rank = board.rank(user_id)
+    return {
+        "period": period,
+        "window": board.key,
+        "total_players": len(board),
+        "entries": [entry(rank, uid) for rank, uid in leaders],
+        "me": entry(my_rank, user_id) if my_rank else None,
+    }
+
+
+def rebuild_leaderboard(db: Session) -> int:
+    """Recompute every window from user_scores (caller commits)"""
+    db.query(LeaderboardEntry).delete()
+    totals: Dict[Tuple[int, str], List] = {}
+    rows = db.query(
+        UserScore.user_id, UserScore.correct, UserScore.percentage, UserScore.created_at
+    ).yield_per(5000)
+    for user_id, correct, percentage, created_at in rows:
+        for key in (ALL_TIME, week_key(created_at)):
+            entry = totals.setdefault((user_id, key), [0, 0.0, 0])
+            entry[0] += correct or 0
+            entry[1] = max(entry[1], percentage or 0.0)
+            entry[2] += 1
+    db.bulk_insert_mappings(LeaderboardEntry, [
+        {"user_id": uid, "period": key, "points": p, "best_percentage": b, "quizzes": q}
+        for (uid, key), (p, b, q) in totals.items()
+    ])
+    on_commit(db, _boards.clear)
+    return len(totals)
+
+
+def ensure_leaderboard(db: Session) -> None:
+    """Backfill the table once for databases that predate it"""
+    if db.query(LeaderboardEntry.user_id).first() is None and db.query(UserScore.id).first() is not None:
+        rebuild_leaderboard(db)
+        db.commit()
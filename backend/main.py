@@ -1,11 +1,23 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 import models
-from database import engine, init_db
+from config import settings
+from database import dispose_async_engines, engine, get_async_engine, read_engine, init_db
+from metrics import MetricsMiddleware, install_sql_hooks
+from profiling import ProfilingMiddleware
+import leaderboard
+import term_cache
+from scores import score_queue
+import answer_log
 
-# Import routers
-from routers import auth, user, admin, quiz
+# Import routers; TECH_VOCAB_DB_ASYNC=1 serves them from async routes on an AsyncEngine
+from routers import metrics
+if settings.db_async:
+    from routers.aio import auth, user, admin, quiz
+else:
+    from routers import auth, user, admin, quiz
 
 # Create database tables
 # models.Base.metadata.create_all(bind=engine)
@@ -24,13 +36,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Request timing + per-request SQL counts, served on /metrics
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    install_sql_hooks(engine)
+    install_sql_hooks(read_engine)
+    if settings.db_async:
+        install_sql_hooks(get_async_engine().sync_engine)
+        install_sql_hooks(get_async_engine(read_only=True).sync_engine)
+
+# Admin-only sampling profiles of single requests flagged with ?profile=1
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize database on startup"""
     init_db()
+    leaderboard.warm()
+    answer_log.start_compactor()
+    if settings.term_snapshot_dir:
+        # Never serve a snapshot older than the database we just opened
+        term_cache.publish_snapshot()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush queued score and answer writes and close pooled async connections"""
+    await run_in_threadpool(score_queue.close, settings.score_queue_shutdown_timeout_seconds)
+    await run_in_threadpool(answer_log.stop, settings.answer_queue_shutdown_timeout_seconds)
+    await dispose_async_engines()
 
 # Health check endpoint
 @app.get("/", tags=["Root"])
@@ -48,6 +86,7 @@ app.include_router(auth.router)      # /api/auth/*
 app.include_router(user.router)      # /api/terms, /api/scores, /api/stats
 app.include_router(quiz.router)      # /api/quiz/*
 app.include_router(admin.router)     # /api/admin/*
+app.include_router(metrics.router)   # /metrics
 
 if __name__ == "__main__":
     import uvicorn
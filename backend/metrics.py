@@ -0,0 +1,192 @@
+"""Per-route request timing and SQL instrumentation.
+
+``MetricsMiddleware`` opens a ``RequestStats`` for every HTTP request and
+the cursor hooks installed by ``install_sql_hooks`` add each statement's
+count and duration to it. The stats object lives in a ContextVar, which
+FastAPI copies into the threadpool running sync routes, so no locking is
+needed on the per-request counters; only the shared histograms take a lock.
+Everything is rendered in Prometheus text format by ``render``.
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import settings
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# ================= PRIMITIVES =================
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.sum:.6f}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+class RequestStats:
+    __slots__ = ("path", "statements", "db_time")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.statements = 0
+        self.db_time = 0.0
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+# ================= REGISTRY =================
+
+class MetricsRegistry:
+    def __init__(self, slow_query_seconds: float, slow_query_samples: int):
+        self.slow_query_seconds = slow_query_seconds
+        self._lock = threading.Lock()
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.db_time: Dict[Tuple[str, str], Histogram] = {}
+        self.statements: Dict[Tuple[str, str], Histogram] = {}
+        self.slow_queries = deque(maxlen=slow_query_samples)
+        self.total_statements = 0
+
+    def observe_request(self, method: str, route: str, status_code: int,
+                        seconds: float, stats: RequestStats) -> None:
+        key = (method, route)
+        with self._lock:
+            status_key = (method, route, status_code)
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.db_time[key] = Histogram(LATENCY_BUCKETS)
+                self.statements[key] = Histogram(STATEMENT_BUCKETS)
+            self.latency[key].observe(seconds)
+            self.db_time[key].observe(stats.db_time)
+            self.statements[key].observe(stats.statements)
+
+    def observe_statement(self, statement: str, seconds: float) -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_time += seconds
+        with self._lock:
+            self.total_statements += 1
+        if seconds >= self.slow_query_seconds:
+            path = stats.path if stats is not None else "-"
+            self.slow_queries.append((seconds, path, " ".join(statement.split())[:300]))
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_total Requests by route and status",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route, status_code), count in sorted(self.requests.items()):
+                lines.append(
+                    f'http_requests_total{{method="{method}",route="{_label(route)}",status="{status_code}"}} {count}'
+                )
+            for name, help_text, series in (
+                ("http_request_duration_seconds", "Request latency by route", self.latency),
+                ("db_time_seconds", "Time spent in SQL per request", self.db_time),
+                ("db_statements_per_request", "SQL statements issued per request", self.statements),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (method, route), histogram in sorted(series.items()):
+                    lines.extend(histogram.render(name, f'method="{method}",route="{_label(route)}"'))
+
+            lines += [
+                "# HELP db_statements_total SQL statements executed",
+                "# TYPE db_statements_total counter",
+                f"db_statements_total {self.total_statements}",
+                "# HELP db_slow_query_seconds Recent statements slower than the slow-query threshold",
+                "# TYPE db_slow_query_seconds gauge",
+            ]
+            for seconds, path, statement in self.slow_queries:
+                lines.append(
+                    f'db_slow_query_seconds{{path="{_label(path)}",statement="{_label(statement)}"}} {seconds:.6f}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry(
+    settings.slow_query_ms / 1000,
+    settings.slow_query_samples
+)
+
+# ================= HOOKS =================
+
+def install_sql_hooks(engine: Engine) -> None:
+    # The start time lives on the statement's execution context, not on the
+    # connection, so a statement that raises leaves nothing behind
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_start", None)
+        if started is not None:
+            registry.observe_statement(statement, time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: times each request and attributes SQL to its route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope["path"])
+        token = _current.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", "unmatched")
+            registry.observe_request(
+                scope["method"], route, status_code, time.perf_counter() - start, stats
+            )
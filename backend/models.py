@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database import Base
@@ -15,6 +15,10 @@ class User(Base):
     
     # Relationships
     scores = relationship("UserScore", back_populates="user", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
 class Term(Base):
     __tablename__ = "terms"
@@ -39,4 +43,102 @@ class UserScore(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    user = relationship("User", back_populates="scores")
\ No newline at end of file
+    user = relationship("User", back_populates="scores")
+    
+    # Keyset pagination indexes for /api/scores/my-history and /api/admin/scores/all
+    __table_args__ = (
+        Index("ix_user_scores_user_created", "user_id", "created_at", "id"),
+        Index("ix_user_scores_created_at_id", "created_at", "id"),
+    )
+
+class StatsSummary(Base):
+    """Single-row running totals behind /api/stats"""
+    __tablename__ = "stats_summary"
+    
+    id = Column(Integer, primary_key=True)
+    total_users = Column(Integer, default=0, nullable=False)
+    total_quizzes = Column(Integer, default=0, nullable=False)
+    percentage_sum = Column(Float, default=0.0, nullable=False)
+    total_questions = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ReviewState(Base):
+    """Spaced-repetition schedule of one term for one user"""
+    __tablename__ = "review_states"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    term_id = Column(Integer, ForeignKey("terms.id"), primary_key=True)
+    ease = Column(Float, default=2.5, nullable=False)
+    interval_days = Column(Float, default=0.0, nullable=False)
+    repetitions = Column(Integer, default=0, nullable=False)
+    lapses = Column(Integer, default=0, nullable=False)
+    due_at = Column(DateTime, nullable=False)
+    last_reviewed_at = Column(DateTime)
+    
+    # "k most overdue for this user" is a range scan on this index
+    __table_args__ = (
+        Index("ix_review_states_user_due", "user_id", "due_at"),
+    )
+
+
+class LeaderboardEntry(Base):
+    """Per-user running totals for one leaderboard window ("all" or an ISO week)"""
+    __tablename__ = "leaderboard_entries"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    period = Column(String, primary_key=True)
+    points = Column(Integer, default=0, nullable=False)
+    best_percentage = Column(Float, default=0.0, nullable=False)
+    quizzes = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_leaderboard_period_points", "period", "points"),
+    )
+
+
+class UserDailyScore(Base):
+    """Per-user totals for one UTC day; the primary key covers /api/stats/me"""
+    __tablename__ = "user_daily_scores"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    quizzes = Column(Integer, default=0, nullable=False)
+    correct = Column(Integer, default=0, nullable=False)
+    total = Column(Integer, default=0, nullable=False)
+    percentage_sum = Column(Float, default=0.0, nullable=False)
+    best_percentage = Column(Float, default=0.0, nullable=False)
+
+
+class AnswerEvent(Base):
+    """Append-only log of graded answers; compacted into TermAnswerStats"""
+    __tablename__ = "answer_events"
+    
+    id = Column(Integer, primary_key=True)
+    term_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    correct = Column(Boolean, nullable=False)
+    response_ms = Column(Integer)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class TermAnswerStats(Base):
+    """Per-term rollup of answer_events up to the compaction watermark"""
+    __tablename__ = "term_answer_stats"
+    
+    term_id = Column(Integer, primary_key=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    correct = Column(Integer, default=0, nullable=False)
+    # JSON list of counts per answer_log.RESPONSE_BUCKETS_MS bucket
+    response_histogram = Column(String, nullable=False, default="[]")
+    median_response_ms = Column(Float)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class RollupWatermark(Base):
+    """Last event id folded into a rollup"""
+    __tablename__ = "rollup_watermarks"
+    
+    name = Column(String, primary_key=True)
+    last_event_id = Column(Integer, default=0, nullable=False)
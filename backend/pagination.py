@@ -0,0 +1,130 @@
+"""Keyset (cursor) pagination and NDJSON streaming for list endpoints.
+
+Rows are ordered on ``(created_at, id)`` and a page resumes strictly after
+the last key it returned, so every page costs one index range scan no
+matter how deep the client has paged. The opaque cursor for the next page
+is returned in the ``X-Next-Cursor`` header, keeping the JSON body a plain
+list. Requests without ``limit``/``cursor`` get the full list as before.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Callable, Optional, Tuple, Type
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query, Session
+
+from config import settings
+from database import ReadSessionLocal
+import fast_json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _ordered_after(query: Query, key, cursor: Optional[str], descending: bool) -> Query:
+    created_col, id_col = key
+    if cursor:
+        position = tuple_(created_col, id_col)
+        after = decode_cursor(cursor)
+        query = query.filter(position < after if descending else position > after)
+    if descending:
+        return query.order_by(created_col.desc(), id_col.desc())
+    return query.order_by(created_col.asc(), id_col.asc())
+
+
+def stream_ndjson(
+    build_query: Callable[[Session], Query],
+    schema: Type[BaseModel],
+    fields: Optional[list] = None
+) -> StreamingResponse:
+    """Stream rows as NDJSON with constant memory.
+
+    The stream owns its own session because it outlives the request's
+    ``get_db`` dependency. With ``fields``, rows are column tuples in that
+    order and are encoded without building a model per row.
+    """
+    def encode(row) -> str:
+        if fields is not None:
+            return fast_json.dumps(dict(zip(fields, row))).decode()
+        return schema.model_validate(row).model_dump_json()
+
+    def lines():
+        db = ReadSessionLocal()
+        try:
+            chunk = []
+            for row in build_query(db).yield_per(STREAM_BATCH_SIZE):
+                chunk.append(encode(row))
+                if len(chunk) >= STREAM_BATCH_SIZE:
+                    yield "\n".join(chunk) + "\n"
+                    chunk = []
+            if chunk:
+                yield "\n".join(chunk) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def keyset_list(
+    db: Session,
+    build_query: Callable[[Session], Query],
+    key,
+    schema: Type[BaseModel],
+    response: Response,
+    limit: Optional[int],
+    cursor: Optional[str],
+    stream: bool,
+    descending: bool = True
+):
+    """Serve a list endpoint as a full list, a keyset page or an NDJSON stream"""
+    fields = None
+    if settings.fast_json_responses:
+        fields, columns = fast_json.schema_columns(schema, key[1].class_)
+        select_columns = lambda query: query.with_entities(*columns)
+    else:
+        select_columns = lambda query: query
+
+    if stream:
+        return stream_ndjson(
+            lambda session: select_columns(_ordered_after(build_query(session), key, cursor, descending)),
+            schema,
+            fields
+        )
+
+    query = select_columns(_ordered_after(build_query(db), key, cursor, descending))
+    headers = {}
+    if limit is None and cursor is None:
+        rows = query.all()
+    else:
+        limit = limit or DEFAULT_PAGE_SIZE
+        rows = query.limit(limit + 1).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+
+    if fields is None:
+        response.headers.update(headers)
+        return rows
+    # A returned Response bypasses response_model and the injected response's headers
+    return fast_json.json_response(fast_json.encode_rows(fields, rows), headers)
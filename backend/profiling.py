@@ -0,0 +1,217 @@
+"""On-demand profiling of single requests.
+
+With ``settings.profiling_enabled``, ``ProfilingMiddleware`` looks for
+``?profile=1`` or an ``X-Profile: 1`` header. If the bearer token belongs
+to an admin and the request wins the ``profile_sample_rate`` draw, a
+sampler thread records the request's stacks every ``profile_interval_ms``.
+Everything else passes straight through after a scan of the query string
+and headers.
+
+Sync routes run on threadpool workers, which a cProfile hook on the event
+loop thread never sees, so this uses stack sampling instead. The sampler
+attributes a worker's stack to the request by checking the contextvars
+Context that the worker is running, and the loop thread's stack by its
+current task. Each profile is saved under ``profile_dir`` as folded stacks
+(``frame;frame;frame count``, the input format of flamegraph.pl and
+speedscope) with a JSON sidecar. Only the newest ``profile_keep`` are kept.
+The response carries the id in ``X-Profile-Id``.
+"""
+import asyncio
+import contextvars
+import json
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from auth_utils import principal_for_token
+from config import settings
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_QUERY = b"profile=1"
+PROFILE_ID_PATTERN = r"^[0-9]+-[0-9a-f]{8}$"
+
+_active: contextvars.ContextVar[Optional["StackSampler"]] = contextvars.ContextVar("profile", default=None)
+
+# ================= SAMPLING =================
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _request_context(frame) -> Optional[contextvars.Context]:
+    """The Context a threadpool worker is running, found on its run() frame"""
+    callee = None
+    while frame is not None:
+        if frame.f_code.co_name == "run":
+            context = frame.f_locals.get("context")
+            if isinstance(context, contextvars.Context):
+                # An idle worker keeps its last Context bound while it
+                # waits on its queue for the next job
+                if callee is None or callee.f_code.co_name == "get":
+                    return None
+                return context
+        callee, frame = frame, frame.f_back
+    return None
+
+
+class StackSampler:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.loop = asyncio.get_running_loop()
+        self.task = asyncio.current_task()
+        self.loop_thread = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> float:
+        self._stop.set()
+        self._thread.join()
+        return time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident == self.loop_thread:
+                    if asyncio.current_task(self.loop) is self.task:
+                        self._record("event-loop", frame)
+                    continue
+                context = _request_context(frame)
+                if context is not None and context.get(_active) is self:
+                    self._record("worker", frame)
+
+    def _record(self, thread: str, frame) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        stack.append(thread)
+        self.stacks[";".join(reversed(stack))] += 1
+
+# ================= STORAGE =================
+
+def new_profile_id() -> str:
+    return f"{time.time_ns() // 1_000_000}-{secrets.token_hex(4)}"
+
+
+def profile_path(profile_id: str, suffix: str = ".folded") -> str:
+    return os.path.join(settings.profile_dir, profile_id + suffix)
+
+
+def save_profile(profile_id: str, meta: dict, stacks: Counter) -> None:
+    os.makedirs(settings.profile_dir, exist_ok=True)
+    with open(profile_path(profile_id), "w", encoding="utf-8") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+    with open(profile_path(profile_id, ".json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    # Ids start with a millisecond timestamp, so name order is age order
+    for stale in list_profile_ids()[settings.profile_keep:]:
+        for suffix in (".json", ".folded"):
+            try:
+                os.remove(profile_path(stale, suffix))
+            except FileNotFoundError:
+                pass
+
+
+def list_profile_ids() -> List[str]:
+    """Stored profile ids, newest first"""
+    try:
+        names = os.listdir(settings.profile_dir)
+    except FileNotFoundError:
+        return []
+    return sorted((name[:-5] for name in names if name.endswith(".json")), reverse=True)
+
+
+def list_profiles() -> List[dict]:
+    profiles = []
+    for profile_id in list_profile_ids():
+        try:
+            with open(profile_path(profile_id, ".json"), encoding="utf-8") as f:
+                profiles.append(json.load(f))
+        except FileNotFoundError:
+            continue  # pruned by another worker
+    return profiles
+
+# ================= MIDDLEWARE =================
+
+def _bearer_token(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"authorization" and value[:7].lower() == b"bearer ":
+            return value[7:].decode("latin-1")
+    return None
+
+
+def _flagged(scope) -> bool:
+    if PROFILE_QUERY in scope.get("query_string", b""):
+        return True
+    return any(name == PROFILE_HEADER and value == b"1" for name, value in scope["headers"])
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware: samples flagged admin requests, passes the rest through"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _flagged(scope):
+            await self.app(scope, receive, send)
+            return
+
+        token = _bearer_token(scope)
+        principal = await run_in_threadpool(principal_for_token, token) if token else None
+        if principal is None or not principal.is_admin or random.random() >= settings.profile_sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = new_profile_id()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        sampler = StackSampler(settings.profile_interval_ms / 1000)
+        reset = _active.set(sampler)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            seconds = sampler.stop()
+            _active.reset(reset)
+            meta = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(scope.get("route"), "path", None),
+                "status": status_code,
+                "admin": principal.username,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "duration_ms": round(seconds * 1000, 3),
+                "interval_ms": settings.profile_interval_ms,
+                "samples": sampler.samples,
+                "attributed_samples": sum(sampler.stacks.values()),
+            }
+            await run_in_threadpool(save_profile, profile_id, meta, sampler.stacks)
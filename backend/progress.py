@@ -0,0 +1,170 @@
+"""Per-user progress for /api/stats/me.
+
+``record_score`` upserts the user's row in ``user_daily_scores`` for the
+quiz's UTC day, inside the score's transaction. Reads only touch that
+rollup through its (user_id, day) primary key, so a report costs one row
+per active day, however many quizzes were played on it.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from database import greatest, upsert_insert
+from leaderboard import week_key
+from models import UserDailyScore, UserScore
+
+TREND_DAYS = 7
+# Averages closer than this many percentage points count as "steady"
+TREND_THRESHOLD = 1.0
+
+# ================= WRITES =================
+
+def record_score(db: Session, user_id: int, correct: int, total: int, percentage: float,
+                 now: Optional[datetime] = None) -> None:
+    """Stage the daily rollup upsert for one quiz (caller commits)"""
+    bind = db.get_bind()
+    table = UserDailyScore.__table__
+    stmt = upsert_insert(bind)(table).values(
+        user_id=user_id, day=(now or datetime.utcnow()).date(), quizzes=1,
+        correct=correct, total=total, percentage_sum=percentage, best_percentage=percentage
+    )
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.day],
+        set_={
+            "quizzes": table.c.quizzes + 1,
+            "correct": table.c.correct + stmt.excluded.correct,
+            "total": table.c.total + stmt.excluded.total,
+            "percentage_sum": table.c.percentage_sum + stmt.excluded.percentage_sum,
+            "best_percentage": greatest(bind, table.c.best_percentage, stmt.excluded.best_percentage),
+        }
+    ))
+
+
+def _as_date(value) -> date:
+    # func.date() comes back as text on SQLite
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def rebuild_progress(db: Session) -> int:
+    """Recompute every user's daily rows from user_scores (caller commits)"""
+    db.query(UserDailyScore).delete()
+    day = func.date(UserScore.created_at)
+    rows = db.query(
+        UserScore.user_id, day, func.count(UserScore.id),
+        func.coalesce(func.sum(UserScore.correct), 0),
+        func.coalesce(func.sum(UserScore.total), 0),
+        func.coalesce(func.sum(UserScore.percentage), 0.0),
+        func.coalesce(func.max(UserScore.percentage), 0.0)
+    ).group_by(UserScore.user_id, day).all()
+    db.bulk_insert_mappings(UserDailyScore, [
+        {"user_id": uid, "day": _as_date(d), "quizzes": q, "correct": c,
+         "total": t, "percentage_sum": p, "best_percentage": b}
+        for uid, d, q, c, t, p, b in rows
+    ])
+    return len(rows)
+
+
+def ensure_progress(db: Session) -> None:
+    """Backfill the rollup once for databases that predate it"""
+    if db.query(UserDailyScore.user_id).first() is None and db.query(UserScore.id).first() is not None:
+        rebuild_progress(db)
+        db.commit()
+
+# ================= READS =================
+
+def _average(quizzes: int, percentage_sum: float) -> Optional[float]:
+    return round(percentage_sum / quizzes, 2) if quizzes else None
+
+
+def current_streak(db: Session, user_id: int, today: date) -> int:
+    """Consecutive active days ending today, or yesterday if nothing yet today"""
+    days = db.query(UserDailyScore.day).filter(
+        UserDailyScore.user_id == user_id, UserDailyScore.day <= today
+    ).order_by(UserDailyScore.day.desc()).yield_per(64)
+
+    streak, expected = 0, None
+    for (day,) in days:
+        if expected is None:
+            if day < today - timedelta(days=1):
+                return 0
+        elif day != expected:
+            break
+        streak += 1
+        expected = day - timedelta(days=1)
+    return streak
+
+
+def _trend(by_day: Dict[date, UserDailyScore], today: date) -> dict:
+    def window(end: date) -> Optional[float]:
+        rows = [by_day[d] for d in (end - timedelta(days=i) for i in range(TREND_DAYS)) if d in by_day]
+        return _average(sum(r.quizzes for r in rows), sum(r.percentage_sum for r in rows))
+
+    recent = window(today)
+    previous = window(today - timedelta(days=TREND_DAYS))
+    change = None if recent is None or previous is None else round(recent - previous, 2)
+    if change is None:
+        direction = None
+    elif change > TREND_THRESHOLD:
+        direction = "improving"
+    elif change < -TREND_THRESHOLD:
+        direction = "declining"
+    else:
+        direction = "steady"
+    return {
+        "days": TREND_DAYS,
+        "recent_average": recent,
+        "previous_average": previous,
+        "change": change,
+        "direction": direction,
+    }
+
+
+def user_progress(db: Session, user_id: int, days: int, today: Optional[date] = None) -> dict:
+    today = today or datetime.utcnow().date()
+    quizzes, correct, total, percentage_sum, best = db.query(
+        func.coalesce(func.sum(UserDailyScore.quizzes), 0),
+        func.coalesce(func.sum(UserDailyScore.correct), 0),
+        func.coalesce(func.sum(UserDailyScore.total), 0),
+        func.coalesce(func.sum(UserDailyScore.percentage_sum), 0.0),
+        func.max(UserDailyScore.best_percentage)
+    ).filter(UserDailyScore.user_id == user_id).one()
+
+    # The trend compares two TREND_DAYS windows, so always load at least that much
+    start = today - timedelta(days=max(days, 2 * TREND_DAYS) - 1)
+    by_day = {
+        row.day: row
+        for row in db.query(UserDailyScore).filter(
+            UserDailyScore.user_id == user_id,
+            UserDailyScore.day >= start,
+            UserDailyScore.day <= today
+        )
+    }
+
+    daily: List[dict] = []
+    weekly: Dict[str, List] = {}
+    for offset in range(days - 1, -1, -1):
+        day = today - timedelta(days=offset)
+        row = by_day.get(day)
+        day_quizzes, day_sum = (row.quizzes, row.percentage_sum) if row else (0, 0.0)
+        daily.append({"day": day.isoformat(), "quizzes": day_quizzes, "average": _average(day_quizzes, day_sum)})
+
+        totals = weekly.setdefault(week_key(day), [0, 0.0])
+        totals[0] += day_quizzes
+        totals[1] += day_sum
+
+    return {
+        "total_quizzes": quizzes,
+        "total_correct": correct,
+        "total_questions": total,
+        "average_score": _average(quizzes, percentage_sum) or 0,
+        "best_score": best or 0,
+        "current_streak": current_streak(db, user_id, today),
+        "daily": daily,
+        "weekly": [
+            {"week": week, "quizzes": q, "average": _average(q, s)}
+            for week, (q, s) in weekly.items()
+        ],
+        "trend": _trend(by_day, today),
+    }
@@ -0,0 +1,255 @@
+"""Throttling for the password endpoints.
+
+Every login and registration is checked before any bcrypt work:
+
+* token buckets per client IP (login and register) and per username
+  (login) cap the request rate and allow a short burst;
+* a sliding window of failed logins per IP and per username locks the key
+  out once it reaches the configured number of failures.
+
+Buckets live in memory in an LRU table with a fixed size; idle buckets,
+which would be full again anyway, expire. Failed attempts are stored in a
+small local SQLite file, so every worker on the host sees the same
+failures. Rejections are 429 responses with ``Retry-After``.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.engine import make_url
+from starlette.concurrency import run_in_threadpool
+
+from config import Settings, settings
+
+# ================= TOKEN BUCKETS =================
+
+class TokenBuckets:
+    """Per-key token buckets in a bounded LRU table"""
+
+    def __init__(self, rate_per_minute: float, burst: int, maxsize: int):
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.maxsize = maxsize
+        # A bucket idle this long is full again and can be forgotten
+        self.idle_expiry = burst / self.rate
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def take(self, key: str, now: Optional[float] = None) -> float:
+        """Spend one token; returns 0 if allowed, else seconds until one is available"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._expire(now)
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def refund(self, key: str) -> None:
+        """Give back the token an attempt spent before another bucket rejected it"""
+        with self._lock:
+            entry = self._buckets.get(key)
+            if entry is not None:
+                tokens, updated = entry
+                self._buckets[key] = (min(self.burst, tokens + 1), updated)
+
+    def _expire(self, now: float) -> None:
+        # Oldest-updated buckets sit at the front
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if now - updated < self.idle_expiry:
+                break
+            del self._buckets[key]
+
+# ================= SHARED FAILURE LOG =================
+
+class FailureLog:
+    """Sliding-window log of failed logins in a SQLite file shared by workers"""
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str, window_seconds: float):
+        self.path = path
+        self.window = window_seconds
+        self._local = threading.local()
+        self._writes = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = wal")
+            conn.execute("PRAGMA synchronous = normal")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS auth_failures (
+                    key TEXT NOT NULL,
+                    failed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_auth_failures_key_at ON auth_failures (key, failed_at)")
+            self._local.conn = conn
+        return conn
+
+    def recent(self, key: str, now: Optional[float] = None) -> Tuple[int, Optional[float]]:
+        """(failures inside the window, time of the oldest of them)"""
+        now = time.time() if now is None else now
+        count, oldest = self._conn().execute(
+            "SELECT COUNT(*), MIN(failed_at) FROM auth_failures WHERE key = ? AND failed_at > ?",
+            (key, now - self.window)
+        ).fetchone()
+        return count, oldest
+
+    def add(self, keys: Iterable[str], now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        conn = self._conn()
+        conn.executemany(
+            "INSERT INTO auth_failures (key, failed_at) VALUES (?, ?)",
+            [(key, now) for key in keys]
+        )
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM auth_failures WHERE failed_at <= ?", (now - self.window,))
+
+    def clear(self, key: str) -> None:
+        self._conn().execute("DELETE FROM auth_failures WHERE key = ?", (key,))
+
+# ================= AUTH THROTTLE =================
+
+def failure_log_path(cfg: Settings) -> str:
+    """auth_throttle_db, else auth_throttle.db beside the main SQLite file"""
+    if cfg.auth_throttle_db:
+        return cfg.auth_throttle_db
+    url = make_url(cfg.database_url)
+    directory = "."
+    if url.get_backend_name() == "sqlite" and url.database and url.database != ":memory:":
+        directory = os.path.dirname(os.path.abspath(url.database))
+    return os.path.join(directory, "auth_throttle.db")
+
+
+class AuthThrottle:
+    def __init__(self, cfg: Settings = settings):
+        self.enabled = cfg.auth_throttle_enabled
+        self.trust_forwarded_for = cfg.trust_forwarded_for
+        self.login_ip = TokenBuckets(cfg.login_ip_per_minute, cfg.login_ip_burst, cfg.throttle_max_keys)
+        self.login_user = TokenBuckets(cfg.login_user_per_minute, cfg.login_user_burst, cfg.throttle_max_keys)
+        self.register_ip = TokenBuckets(cfg.register_ip_per_minute, cfg.register_ip_burst, cfg.throttle_max_keys)
+        self.failures = FailureLog(failure_log_path(cfg), cfg.login_failure_window_seconds)
+        self.max_failures_per_ip = cfg.login_max_failures_per_ip
+        self.max_failures_per_user = cfg.login_max_failures_per_user
+        self.rejected = 0
+
+    def client_ip(self, request: Request) -> str:
+        if self.trust_forwarded_for:
+            forwarded = request.headers.get("x-forwarded-for")
+            if forwarded:
+                return forwarded.split(",")[0].strip()
+        return request.client.host if request.client else "unknown"
+
+    def _reject(self, retry_after: float) -> HTTPException:
+        self.rejected += 1
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many attempts, please retry later",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    def check_login(self, ip: str, username: str) -> None:
+        wait = self.login_ip.take(ip)
+        if wait:
+            raise self._reject(wait)
+        wait = self.login_user.take(username)
+        if wait:
+            # A locked-out account must not use up its IP's budget for other users
+            self.login_ip.refund(ip)
+            raise self._reject(wait)
+
+    def check_failures(self, ip: str, username: str) -> int:
+        """Reject locked-out keys; returns the username's recent failure count"""
+        now = time.time()
+        for key, limit in ((f"ip:{ip}", self.max_failures_per_ip),
+                           (f"user:{username}", self.max_failures_per_user)):
+            count, oldest = self.failures.recent(key, now)
+            if count >= limit:
+                raise self._reject(oldest + self.failures.window - now)
+        return count
+
+    def check_register(self, ip: str) -> None:
+        wait = self.register_ip.take(ip)
+        if wait:
+            raise self._reject(wait)
+
+    def login_failed(self, ip: str, username: str) -> None:
+        self.failures.add((f"ip:{ip}", f"user:{username}"))
+
+    def login_succeeded(self, username: str) -> None:
+        self.failures.clear(f"user:{username}")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "rejected": self.rejected,
+            "login_ip_keys": len(self.login_ip),
+            "login_user_keys": len(self.login_user),
+            "register_ip_keys": len(self.register_ip),
+        }
+
+
+auth_throttle = AuthThrottle()
+
+
+def _username_key(username: str) -> str:
+    return username.lower().strip()
+
+# ================= DEPENDENCIES =================
+
+class LoginAttempt:
+    """Identifies a login for failure bookkeeping once the password is checked"""
+
+    def __init__(self, ip: str, username: str):
+        self.ip = ip
+        self.username = username
+        self.previous_failures = 0
+
+    async def failed(self) -> None:
+        if auth_throttle.enabled:
+            await run_in_threadpool(auth_throttle.login_failed, self.ip, self.username)
+
+    async def succeeded(self) -> None:
+        if auth_throttle.enabled and self.previous_failures:
+            await run_in_threadpool(auth_throttle.login_succeeded, self.username)
+
+
+async def throttle_login(
+    request: Request,
+    form_data: OAuth2PasswordRequestForm = Depends()
+) -> LoginAttempt:
+    attempt = LoginAttempt(auth_throttle.client_ip(request), _username_key(form_data.username))
+    if auth_throttle.enabled:
+        auth_throttle.check_login(attempt.ip, attempt.username)
+        attempt.previous_failures = await run_in_threadpool(
+            auth_throttle.check_failures, attempt.ip, attempt.username
+        )
+    return attempt
+
+
+async def throttle_register(request: Request) -> None:
+    if auth_throttle.enabled:
+        auth_throttle.check_register(auth_throttle.client_ip(request))
@@ -0,0 +1,103 @@
+"""SM-2 style spaced repetition.
+
+Every graded answer updates the (user, term) ``ReviewState``: correct
+answers grow the interval by the term's ease factor, wrong ones reset it
+to a short relearning step and lower the ease. ``due_terms`` picks the
+most overdue terms through the ``(user_id, due_at)`` index and tops up
+with terms the user has never seen, so selection cost depends on k, not
+on the size of the user's history.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from database import upsert_insert
+from models import ReviewState
+from term_cache import TermCatalog, TermRecord
+
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+RELEARN_INTERVAL_DAYS = 10 / (24 * 60)  # 10 minutes
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+
+def schedule(state: ReviewState, quality: int, now: datetime) -> None:
+    """Apply one review of the given quality (0-5) to state"""
+    if quality < 3:
+        state.repetitions = 0
+        state.lapses = (state.lapses or 0) + 1
+        state.interval_days = RELEARN_INTERVAL_DAYS
+    else:
+        if not state.repetitions:
+            state.interval_days = 1.0
+        elif state.repetitions == 1:
+            state.interval_days = 6.0
+        else:
+            state.interval_days = state.interval_days * state.ease
+        state.repetitions = (state.repetitions or 0) + 1
+
+    state.ease = max(MIN_EASE, state.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    state.last_reviewed_at = now
+    state.due_at = now + timedelta(days=state.interval_days)
+
+
+def record_review(db: Session, user_id: int, term_id: int, correct: bool,
+                  now: Optional[datetime] = None) -> ReviewState:
+    """Stage the schedule update for one answer (caller commits)"""
+    now = now or datetime.utcnow()
+    state = db.get(ReviewState, (user_id, term_id))
+    if state is None:
+        # Two concurrent first answers both get here; the loser of the
+        # insert race updates the winner's row instead of failing on the
+        # primary key
+        stmt = upsert_insert(db.get_bind())(ReviewState).values(
+            user_id=user_id, term_id=term_id, ease=DEFAULT_EASE,
+            interval_days=0.0, repetitions=0, lapses=0, due_at=now
+        ).on_conflict_do_nothing(
+            index_elements=[ReviewState.user_id, ReviewState.term_id]
+        ).returning(ReviewState)
+        state = db.scalars(stmt).first() or db.get(ReviewState, (user_id, term_id))
+    schedule(state, QUALITY_CORRECT if correct else QUALITY_WRONG, now)
+    return state
+
+
+def due_terms(db: Session, catalog: TermCatalog, user_id: int, k: int) -> List[TermRecord]:
+    """Up to k terms: most overdue first, then unseen terms, then the soonest due"""
+    now = datetime.utcnow()
+    selected: List[TermRecord] = []
+    chosen = set()
+
+    def take(term_ids):
+        for term_id in term_ids:
+            term = catalog.get(term_id)  # skips reviews of deleted terms
+            if term is not None and term_id not in chosen and len(selected) < k:
+                chosen.add(term_id)
+                selected.append(term)
+
+    overdue = db.query(ReviewState.term_id).filter(
+        ReviewState.user_id == user_id,
+        ReviewState.due_at <= now
+    ).order_by(ReviewState.due_at).limit(k * 2)
+    take(row.term_id for row in overdue)
+
+    if len(selected) < k:
+        candidates = [t.id for t in catalog.sample((k - len(selected)) * 3) if t.id not in chosen]
+        if candidates:
+            reviewed = {
+                row.term_id for row in db.query(ReviewState.term_id).filter(
+                    ReviewState.user_id == user_id,
+                    ReviewState.term_id.in_(candidates)
+                )
+            }
+            take(term_id for term_id in candidates if term_id not in reviewed)
+
+    if len(selected) < k:
+        upcoming = db.query(ReviewState.term_id).filter(
+            ReviewState.user_id == user_id,
+            ReviewState.due_at > now
+        ).order_by(ReviewState.due_at).limit((k - len(selected)) * 2)
+        take(row.term_id for row in upcoming)
+
+    return selected
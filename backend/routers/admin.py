@@ -1,11 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
 
 import models
 import schemas
-from database import get_db
-from auth_utils import get_current_admin
+from database import get_db, get_read_db
+from auth_utils import Principal, get_current_admin, password_executor, principal_cache
+import term_cache
+from rate_limit import auth_throttle
+from pagination import MAX_PAGE_SIZE, keyset_list
+import term_io
+import answer_log
+import profiling
 
 router = APIRouter(
     prefix="/api/admin",
@@ -15,7 +25,7 @@ router = APIRouter(
 @router.post("/terms", response_model=schemas.TermResponse)
 def create_term(
     term_data: schemas.TermCreate,
-    current_admin: models.User = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     """Create a new term (Admin only)"""
@@ -34,6 +44,7 @@ def create_term(
     db.add(new_term)
     db.commit()
     db.refresh(new_term)
+    term_cache.invalidate()
     
     return new_term
 
@@ -41,7 +52,7 @@ def create_term(
 def update_term(
     term_id: int,
     term_data: schemas.TermUpdate,
-    current_admin: models.User = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     """Update a term (Admin only)"""
@@ -57,13 +68,14 @@ def update_term(
     
     db.commit()
     db.refresh(term)
+    term_cache.invalidate()
     
     return term
 
 @router.delete("/terms/{term_id}")
 def delete_term(
     term_id: int,
-    current_admin: models.User = Depends(get_current_admin),
+    current_admin: Principal = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
     """Delete a term (Admin only)"""
@@ -74,25 +86,128 @@ def delete_term(
     
     db.delete(term)
     db.commit()
+    term_cache.invalidate()
     
     return {"message": f"Term '{term.term}' deleted successfully"}
 
+@router.post("/terms/import")
+async def import_terms(
+    request: Request,
+    chunk_size: int = Query(term_io.IMPORT_CHUNK_SIZE, ge=1, le=10_000),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Upsert terms from a streamed JSON array or NDJSON body (Admin only)"""
+    return {"imported": await import_stream(request, chunk_size)}
+
+async def import_stream(request: Request, chunk_size: int) -> int:
+    parser = term_io.TermStreamParser()
+    pending = []
+    imported = 0
+    try:
+        async for data in request.stream():
+            pending.extend(parser.feed(data))
+            while len(pending) >= chunk_size:
+                chunk, pending = pending[:chunk_size], pending[chunk_size:]
+                imported += await run_in_threadpool(term_io.upsert_terms, chunk)
+        pending.extend(parser.close())
+        imported += await run_in_threadpool(term_io.upsert_terms, pending)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{exc} ({imported} terms were imported before the error)"
+        )
+    finally:
+        await run_in_threadpool(term_cache.invalidate)
+    
+    return imported
+
+@router.get("/terms/export")
+def export_terms(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    style: str = Query("model", pattern="^(model|camel)$"),
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Stream every term as NDJSON or a JSON array (Admin only)"""
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    return StreamingResponse(term_io.iter_export(format, style), media_type=media_type)
+
 @router.get("/users", response_model=List[schemas.UserResponse])
 def get_all_users(
-    current_admin: models.User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    current_admin: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
 ):
-    """Get all users (Admin only)"""
-    users = db.query(models.User).all()
-    return users
+    """Get all users, oldest first (Admin only)"""
+    return keyset_list(
+        db,
+        lambda session: session.query(models.User),
+        (models.User.created_at, models.User.id),
+        schemas.UserResponse,
+        response, limit, cursor, stream,
+        descending=False
+    )
 
 @router.get("/scores/all", response_model=List[schemas.ScoreResponse])
 def get_all_scores(
-    current_admin: models.User = Depends(get_current_admin),
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    current_admin: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Get all user scores, newest first (Admin only)"""
+    return keyset_list(
+        db,
+        lambda session: session.query(models.UserScore),
+        (models.UserScore.created_at, models.UserScore.id),
+        schemas.ScoreResponse,
+        response, limit, cursor, stream
+    )
+
+@router.get("/cache/stats")
+def get_cache_stats(
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """In-process cache counters (Admin only)"""
+    return {
+        "principals": principal_cache.stats(),
+        "password_executor": password_executor.stats(),
+        "auth_throttle": auth_throttle.stats(),
+        "term_catalog": {"version": term_cache.current_version()}
+    }
+
+@router.get("/analytics/terms")
+def get_term_analytics(
+    sort: str = Query("attempts", pattern="^(attempts|accuracy)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    mismatched_only: bool = False,
+    current_admin: Principal = Depends(get_current_admin),
+    db: Session = Depends(get_read_db)
+):
+    """Per-term attempts, accuracy and median answer time with a suggested difficulty (Admin only)"""
+    return {
+        "compacted_through_event": answer_log.compacted_through(db),
+        "terms": answer_log.term_report(db, term_cache.get_catalog(db), sort, limit, mismatched_only)
+    }
+
+@router.get("/profiles")
+def list_request_profiles(
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Stored request profiles, newest first (Admin only)"""
+    return profiling.list_profiles()
+
+@router.get("/profiles/{profile_id}")
+def download_request_profile(
+    profile_id: str = Path(..., pattern=profiling.PROFILE_ID_PATTERN),
+    current_admin: Principal = Depends(get_current_admin)
 ):
-    """Get all user scores (Admin only)"""
-    scores = db.query(models.UserScore).order_by(
-        models.UserScore.created_at.desc()
-    ).all()
-    return scores
\ No newline at end of file
+    """Download one request profile as folded stacks (Admin only)"""
+    path = profiling.profile_path(profile_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"profile-{profile_id}.folded")
@@ -0,0 +1,192 @@
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+import models
+import schemas
+from database import get_async_db, get_async_read_db
+from auth_utils import Principal, get_current_admin_aio, password_executor, principal_cache
+import term_cache
+from rate_limit import auth_throttle
+from pagination import MAX_PAGE_SIZE, keyset_list
+import term_io
+import answer_log
+import profiling
+from routers.admin import import_stream
+
+router = APIRouter(
+    prefix="/api/admin",
+    tags=["Admin"]
+)
+
+@router.post("/terms", response_model=schemas.TermResponse)
+async def create_term(
+    term_data: schemas.TermCreate,
+    current_admin: Principal = Depends(get_current_admin_aio),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new term (Admin only)"""
+    existing_term = await db.scalar(
+        select(models.Term.id).where(models.Term.term == term_data.term)
+    )
+    
+    if existing_term:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Term already exists"
+        )
+    
+    new_term = models.Term(**term_data.dict())
+    db.add(new_term)
+    await db.commit()
+    await db.refresh(new_term)
+    await run_in_threadpool(term_cache.invalidate)
+    
+    return new_term
+
+@router.put("/terms/{term_id}", response_model=schemas.TermResponse)
+async def update_term(
+    term_id: int,
+    term_data: schemas.TermUpdate,
+    current_admin: Principal = Depends(get_current_admin_aio),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update a term (Admin only)"""
+    term = await db.get(models.Term, term_id)
+    
+    if not term:
+        raise HTTPException(status_code=404, detail="Term not found")
+    
+    update_data = term_data.dict(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(term, key, value)
+    
+    await db.commit()
+    await db.refresh(term)
+    await run_in_threadpool(term_cache.invalidate)
+    
+    return term
+
+@router.delete("/terms/{term_id}")
+async def delete_term(
+    term_id: int,
+    current_admin: Principal = Depends(get_current_admin_aio),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a term (Admin only)"""
+    term = await db.get(models.Term, term_id)
+    
+    if not term:
+        raise HTTPException(status_code=404, detail="Term not found")
+    
+    await db.delete(term)
+    await db.commit()
+    await run_in_threadpool(term_cache.invalidate)
+    
+    return {"message": f"Term '{term.term}' deleted successfully"}
+
+@router.post("/terms/import")
+async def import_terms(
+    request: Request,
+    chunk_size: int = Query(term_io.IMPORT_CHUNK_SIZE, ge=1, le=10_000),
+    current_admin: Principal = Depends(get_current_admin_aio)
+):
+    """Upsert terms from a streamed JSON array or NDJSON body (Admin only)"""
+    return {"imported": await import_stream(request, chunk_size)}
+
+@router.get("/terms/export")
+async def export_terms(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    style: str = Query("model", pattern="^(model|camel)$"),
+    current_admin: Principal = Depends(get_current_admin_aio)
+):
+    """Stream every term as NDJSON or a JSON array (Admin only)"""
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    return StreamingResponse(term_io.iter_export(format, style), media_type=media_type)
+
+@router.get("/users", response_model=List[schemas.UserResponse])
+async def get_all_users(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    current_admin: Principal = Depends(get_current_admin_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get all users, oldest first (Admin only)"""
+    return await db.run_sync(lambda session: keyset_list(
+        session,
+        lambda s: s.query(models.User),
+        (models.User.created_at, models.User.id),
+        schemas.UserResponse,
+        response, limit, cursor, stream,
+        descending=False
+    ))
+
+@router.get("/scores/all", response_model=List[schemas.ScoreResponse])
+async def get_all_scores(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    current_admin: Principal = Depends(get_current_admin_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get all user scores, newest first (Admin only)"""
+    return await db.run_sync(lambda session: keyset_list(
+        session,
+        lambda s: s.query(models.UserScore),
+        (models.UserScore.created_at, models.UserScore.id),
+        schemas.ScoreResponse,
+        response, limit, cursor, stream
+    ))
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_admin: Principal = Depends(get_current_admin_aio)
+):
+    """In-process cache counters (Admin only)"""
+    return {
+        "principals": principal_cache.stats(),
+        "password_executor": password_executor.stats(),
+        "auth_throttle": auth_throttle.stats(),
+        "term_catalog": {"version": term_cache.current_version()}
+    }
+
+@router.get("/analytics/terms")
+async def get_term_analytics(
+    sort: str = Query("attempts", pattern="^(attempts|accuracy)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    mismatched_only: bool = False,
+    current_admin: Principal = Depends(get_current_admin_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Per-term attempts, accuracy and median answer time with a suggested difficulty (Admin only)"""
+    catalog = await term_cache.get_catalog_async(db)
+    return await db.run_sync(lambda session: {
+        "compacted_through_event": answer_log.compacted_through(session),
+        "terms": answer_log.term_report(session, catalog, sort, limit, mismatched_only)
+    })
+
+@router.get("/profiles")
+async def list_request_profiles(
+    current_admin: Principal = Depends(get_current_admin_aio)
+):
+    """Stored request profiles, newest first (Admin only)"""
+    return profiling.list_profiles()
+
+@router.get("/profiles/{profile_id}")
+async def download_request_profile(
+    profile_id: str = Path(..., pattern=profiling.PROFILE_ID_PATTERN),
+    current_admin: Principal = Depends(get_current_admin_aio)
+):
+    """Download one request profile as folded stacks (Admin only)"""
+    path = profiling.profile_path(profile_id)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"profile-{profile_id}.folded")
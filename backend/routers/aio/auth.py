@@ -0,0 +1,81 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import get_async_db, get_async_read_db, run_write_async
+from models import User
+import schemas
+from rate_limit import LoginAttempt, throttle_login, throttle_register
+from auth_utils import (
+    Principal,
+    authenticate_user_aio,
+    create_access_token,
+    get_password_hash_async,
+    get_current_user_aio
+)
+from routers.auth import _ensure_unique, _insert_user
+
+router = APIRouter(
+    prefix="/api/auth",
+    tags=["Authentication"]
+)
+
+# ================= REGISTER =================
+
+@router.post("/register", response_model=schemas.Token, dependencies=[Depends(throttle_register)])
+async def register(
+    user_data: schemas.UserCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    await db.run_sync(_ensure_unique, user_data)
+    hashed_password = await get_password_hash_async(user_data.password)
+    user = await run_write_async(
+        db, lambda session: _insert_user(session, user_data, hashed_password)
+    )
+    await db.refresh(user)
+
+    token = create_access_token({"sub": user.username})
+
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "user": user
+    }
+
+# ================= LOGIN (SWAGGER FORM) =================
+
+@router.post("/login", response_model=schemas.Token)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    attempt: LoginAttempt = Depends(throttle_login),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    user = await authenticate_user_aio(db, form_data.username, form_data.password)
+
+    if not user:
+        await attempt.failed()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password"
+        )
+
+    await attempt.succeeded()
+    token = create_access_token({"sub": user.username})
+
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "user": user
+    }
+
+# ================= ME =================
+
+@router.get("/me", response_model=schemas.UserResponse)
+async def me(
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    user = await db.get(User, current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
@@ -0,0 +1,111 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+
+import schemas
+from database import get_async_db, get_async_read_db, run_write_async
+from scores import add_score
+from auth_utils import Principal, get_current_user_aio
+from term_cache import get_catalog_async
+from review import due_terms, record_review
+from answer_log import record_answers
+from routers.quiz import _parse_weights, _quiz_payload, grade_answer
+
+router = APIRouter(
+    prefix="/api/quiz",
+    tags=["Quiz"]
+)
+
+@router.get("/random")
+async def get_random_quiz(
+    count: int = 5,
+    difficulty: Optional[str] = None,
+    weights: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get random terms for quiz (requires authentication)"""
+    catalog = await get_catalog_async(db)
+    selected_terms = catalog.sample(count, difficulty, _parse_weights(weights))
+    
+    if len(selected_terms) == 0:
+        raise HTTPException(status_code=404, detail="No terms available")
+    
+    return _quiz_payload(selected_terms)
+
+@router.get("/due")
+async def get_due_quiz(
+    count: int = 5,
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get the user's most overdue terms, topped up with new ones (requires authentication)"""
+    catalog = await get_catalog_async(db)
+    selected_terms = await db.run_sync(
+        lambda session: due_terms(session, catalog, current_user.id, count)
+    )
+    
+    if len(selected_terms) == 0:
+        raise HTTPException(status_code=404, detail="No terms available")
+    
+    return _quiz_payload(selected_terms)
+
+@router.post("/check", response_model=schemas.AnswerResponse)
+async def check_answer(
+    answer: schemas.Answer,
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Check if answer is correct and reschedule the term (requires authentication)"""
+    catalog = await get_catalog_async(db)
+    term = catalog.get(answer.term_id)
+    
+    if not term:
+        raise HTTPException(status_code=404, detail="Term not found")
+    
+    # Grading may build the AnswerIndex and runs edit distances; keep it off the loop
+    result = await run_in_threadpool(grade_answer, catalog, term, answer.user_answer)
+    await run_write_async(
+        db, lambda session: record_review(session, current_user.id, term.id, result["correct"])
+    )
+    record_answers(current_user.id, [(term.id, result["correct"], answer.response_ms)])
+    return result
+
+@router.post("/check-batch", response_model=schemas.BatchAnswerResponse)
+async def check_answers_batch(
+    batch: schemas.BatchAnswer,
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Grade a whole quiz and save its score in one request (requires authentication)"""
+    catalog = await get_catalog_async(db)
+    
+    terms = []
+    for answer in batch.answers:
+        term = catalog.get(answer.term_id)
+        if not term:
+            raise HTTPException(status_code=404, detail=f"Term {answer.term_id} not found")
+        terms.append(term)
+    
+    results = await run_in_threadpool(lambda: [
+        {"term_id": term.id, **grade_answer(catalog, term, answer.user_answer)}
+        for term, answer in zip(terms, batch.answers)
+    ])
+    
+    correct = sum(1 for r in results if r["correct"])
+    
+    def save(session: Session):
+        for r in results:
+            record_review(session, current_user.id, r["term_id"], r["correct"])
+        return add_score(session, current_user.id, correct, len(results))
+    
+    score = await run_write_async(db, save)
+    record_answers(
+        current_user.id,
+        [(r["term_id"], r["correct"], a.response_ms) for r, a in zip(results, batch.answers)]
+    )
+    await db.refresh(score)
+    
+    return {"results": results, "score": score}
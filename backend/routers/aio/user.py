@@ -0,0 +1,139 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+
+import models
+import schemas
+from database import get_async_db, get_async_read_db, run_write_async
+from auth_utils import Principal, get_current_user_aio
+from term_cache import get_catalog_async
+import stats
+from scores import add_score
+from search import search_term_ids
+from http_cache import cached_json_response, catalog_body, prepare_encoding, term_body
+import leaderboard
+import progress
+from pagination import MAX_PAGE_SIZE, keyset_list
+from config import settings
+from routers.user import accepted_score, enqueue_score, group_commit_timeout, score_unavailable, stats_payload
+
+router = APIRouter(
+    prefix="/api",
+    tags=["User"]
+)
+
+@router.get("/terms", response_model=List[schemas.TermResponse])
+async def get_all_terms(
+    request: Request,
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get all terms; supports If-None-Match (requires authentication)"""
+    catalog = await get_catalog_async(db)
+    accept_encoding = request.headers.get("accept-encoding", "")
+    # Serializing and compressing a cold body is CPU work; keep both off the loop
+    cached = await run_in_threadpool(lambda: prepare_encoding(catalog_body(catalog), accept_encoding))
+    return cached_json_response(request, cached)
+
+@router.get("/terms/search", response_model=List[schemas.TermResponse])
+async def search_terms(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Ranked search across term, definition, example and real_world (requires authentication)"""
+    catalog = await get_catalog_async(db)
+    term_ids = await db.run_sync(search_term_ids, q, limit)
+    results = (catalog.get(term_id) for term_id in term_ids)
+    return [term for term in results if term is not None]
+
+@router.get("/terms/{term_id}", response_model=schemas.TermResponse)
+async def get_term(
+    term_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get a specific term by ID; supports If-None-Match (requires authentication)"""
+    cached = term_body(await get_catalog_async(db), term_id)
+    if not cached:
+        raise HTTPException(status_code=404, detail="Term not found")
+    return cached_json_response(request, cached)
+
+@router.post("/scores", response_model=schemas.ScoreResponse)
+async def save_score(
+    score_data: schemas.ScoreCreate,
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Save user score (requires authentication)"""
+    if settings.score_write_mode != "direct":
+        submission, future = enqueue_score(current_user.id, score_data)
+        if settings.score_write_mode == "group":
+            try:
+                # Shielded: cancelling the queue's future would fail its batch on set_result
+                return await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), group_commit_timeout()
+                )
+            except (asyncio.TimeoutError, RuntimeError):
+                raise score_unavailable()
+        return accepted_score(submission)
+    
+    new_score = await run_write_async(
+        db,
+        lambda session: add_score(session, current_user.id, score_data.correct, score_data.total)
+    )
+    await db.refresh(new_score)
+    
+    return new_score
+
+@router.get("/scores/my-history", response_model=List[schemas.ScoreResponse])
+async def get_my_scores(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get current user's score history, newest first (requires authentication)"""
+    return await db.run_sync(lambda session: keyset_list(
+        session,
+        lambda s: s.query(models.UserScore).filter(
+            models.UserScore.user_id == current_user.id
+        ),
+        (models.UserScore.created_at, models.UserScore.id),
+        schemas.ScoreResponse,
+        response, limit, cursor, stream
+    ))
+
+@router.get("/stats")
+async def get_stats(
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get overall statistics (requires authentication)"""
+    return stats_payload(await db.run_sync(stats.get_summary))
+
+@router.get("/stats/me")
+async def get_my_stats(
+    days: int = Query(14, ge=1, le=90),
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Current user's averages, best score, streak and trend (requires authentication)"""
+    return await db.run_sync(progress.user_progress, current_user.id, days)
+
+@router.get("/leaderboard")
+async def get_leaderboard(
+    period: str = Query(leaderboard.ALL_TIME, pattern="^(all|weekly)$"),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: Principal = Depends(get_current_user_aio),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Top players plus the caller's own rank (requires authentication)"""
+    board = await leaderboard.get_board_async(period, db)
+    return await db.run_sync(leaderboard.standings, period, limit, current_user.id, board)
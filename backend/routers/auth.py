@@ -1,14 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from database import get_db
+from database import get_db, get_read_db, run_write
 from models import User
 import schemas
+from rate_limit import LoginAttempt, throttle_login, throttle_register
+import stats
 from auth_utils import (
-    authenticate_user,
+    Principal,
+    authenticate_user_async,
     create_access_token,
-    get_password_hash,
+    get_password_hash_async,
     get_current_user
 )
 
@@ -19,27 +23,39 @@ router = APIRouter(
 
 # ================= REGISTER =================
 
-@router.post("/register", response_model=schemas.Token)
-def register(
-    user_data: schemas.UserCreate,
-    db: Session = Depends(get_db)
-):
+def _ensure_unique(db: Session, user_data: schemas.UserCreate) -> None:
     if db.query(User).filter(User.username == user_data.username).first():
         raise HTTPException(400, "Username already exists")
 
     if db.query(User).filter(User.email == user_data.email).first():
         raise HTTPException(400, "Email already exists")
 
+def _insert_user(session: Session, user_data: schemas.UserCreate, hashed_password: str) -> User:
     user = User(
         username=user_data.username,
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=hashed_password,
         is_admin=False
     )
+    session.add(user)
+    stats.record_user(session)
+    return user
 
-    db.add(user)
-    db.commit()
+def _create_user(db: Session, user_data: schemas.UserCreate, hashed_password: str) -> User:
+    user = run_write(db, lambda session: _insert_user(session, user_data, hashed_password))
     db.refresh(user)
+    return user
+
+# DB work runs on the shared threadpool (it is short); bcrypt runs on
+# the dedicated password executor and may answer 503 when saturated.
+@router.post("/register", response_model=schemas.Token, dependencies=[Depends(throttle_register)])
+async def register(
+    user_data: schemas.UserCreate,
+    db: Session = Depends(get_db)
+):
+    await run_in_threadpool(_ensure_unique, db, user_data)
+    hashed_password = await get_password_hash_async(user_data.password)
+    user = await run_in_threadpool(_create_user, db, user_data, hashed_password)
 
     token = create_access_token({"sub": user.username})
 
@@ -52,18 +68,21 @@ def register(
 # ================= LOGIN (SWAGGER FORM) =================
 
 @router.post("/login", response_model=schemas.Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    attempt: LoginAttempt = Depends(throttle_login),
+    db: Session = Depends(get_read_db)
 ):
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
 
     if not user:
+        await attempt.failed()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password"
         )
 
+    await attempt.succeeded()
     token = create_access_token({"sub": user.username})
 
     return {
@@ -76,6 +95,10 @@ def login(
 
 @router.get("/me", response_model=schemas.UserResponse)
 def me(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
-    return current_user
+    user = db.get(User, current_user.id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
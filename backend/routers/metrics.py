@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+import term_cache
+from auth_utils import Principal, get_current_admin, password_executor, principal_cache
+from metrics import registry
+from rate_limit import auth_throttle
+from scores import score_queue
+from answer_log import answer_queue
+from write_behind import queue_metric_lines
+
+router = APIRouter(tags=["Metrics"])
+
+def _cache_lines():
+    principals = principal_cache.stats()
+    executor = password_executor.stats()
+    return [
+        "# TYPE principal_cache_hits_total counter",
+        f"principal_cache_hits_total {principals['hits']}",
+        "# TYPE principal_cache_misses_total counter",
+        f"principal_cache_misses_total {principals['misses']}",
+        "# TYPE principal_cache_size gauge",
+        f"principal_cache_size {principals['size']}",
+        "# TYPE password_executor_in_flight gauge",
+        f"password_executor_in_flight {executor['in_flight']}",
+        "# TYPE password_executor_rejected_total counter",
+        f"password_executor_rejected_total {executor['rejected']}",
+        "# TYPE auth_throttle_rejected_total counter",
+        f"auth_throttle_rejected_total {auth_throttle.rejected}",
+        "# TYPE term_catalog_version gauge",
+        f"term_catalog_version {term_cache.current_version()}",
+        *queue_metric_lines([score_queue, answer_queue]),
+    ]
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics(
+    current_admin: Principal = Depends(get_current_admin)
+):
+    """Prometheus metrics (Admin only)"""
+    body = registry.render() + "\n".join(_cache_lines()) + "\n"
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
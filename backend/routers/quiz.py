@@ -1,33 +1,78 @@
+import math
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-import random
+from typing import Dict, Optional
 
 import models
 import schemas
-from database import get_db
-from auth_utils import get_current_user
+from database import get_db, get_read_db, run_write
+from scores import add_score
+from auth_utils import Principal, get_current_user
+from term_cache import TermCatalog, TermRecord, get_catalog
+from answer_index import get_answer_index
+from review import due_terms, record_review
+from answer_log import record_answers
 
 router = APIRouter(
     prefix="/api/quiz",
     tags=["Quiz"]
 )
 
+def _parse_weights(weights: Optional[str]) -> Optional[Dict[str, float]]:
+    """Parse ``easy:1,medium:2,hard:3`` into a difficulty -> weight map"""
+    if not weights:
+        return None
+    parsed = {}
+    try:
+        for part in weights.split(","):
+            difficulty, weight = part.split(":")
+            parsed[difficulty.strip()] = float(weight)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="weights must look like 'easy:1,medium:2,hard:3'"
+        )
+    # inf and nan pass a "< 0" check but make random.choices raise, and so
+    # does a total that overflows to inf (easy:1e308,hard:1e308)
+    values = parsed.values()
+    if any(w < 0 or not math.isfinite(w) for w in values) or not math.isfinite(sum(values)):
+        raise HTTPException(status_code=400, detail="weights must be finite and not negative")
+    return parsed
+
 @router.get("/random")
 def get_random_quiz(
     count: int = 5,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    difficulty: Optional[str] = None,
+    weights: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get random terms for quiz (requires authentication)"""
-    all_terms = db.query(models.Term).all()
+    selected_terms = get_catalog(db).sample(count, difficulty, _parse_weights(weights))
     
-    if len(all_terms) == 0:
+    if len(selected_terms) == 0:
         raise HTTPException(status_code=404, detail="No terms available")
     
-    selected_terms = random.sample(all_terms, min(count, len(all_terms)))
+    return _quiz_payload(selected_terms)
+
+@router.get("/due")
+def get_due_quiz(
+    count: int = 5,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get the user's most overdue terms, topped up with new ones (requires authentication)"""
+    selected_terms = due_terms(db, get_catalog(db), current_user.id, count)
+    
+    if len(selected_terms) == 0:
+        raise HTTPException(status_code=404, detail="No terms available")
     
+    return _quiz_payload(selected_terms)
+
+def _quiz_payload(terms):
     quiz = []
-    for term in selected_terms:
+    for term in terms:
         quiz.append({
             "id": term.id,
             "definition": term.definition,
@@ -37,22 +82,67 @@ def get_random_quiz(
     
     return {"questions": quiz, "total": len(quiz)}
 
+def grade_answer(catalog: TermCatalog, term: TermRecord, user_answer: str) -> dict:
+    """Grade one answer; wrong answers get the closest catalog term as a hint"""
+    index = get_answer_index(catalog)
+    is_correct = index.matches(term, user_answer)
+    suggestion = None
+    if not is_correct:
+        closest = index.suggest(user_answer)
+        suggestion = closest.term if closest else None
+    return {
+        "correct": is_correct,
+        "correct_answer": term.term,
+        "real_world": term.real_world,
+        "suggestion": suggestion
+    }
+
 @router.post("/check", response_model=schemas.AnswerResponse)
 def check_answer(
     answer: schemas.Answer,
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Check if answer is correct (requires authentication)"""
-    term = db.query(models.Term).filter(models.Term.id == answer.term_id).first()
+    """Check if answer is correct and reschedule the term (requires authentication)"""
+    catalog = get_catalog(db)
+    term = catalog.get(answer.term_id)
     
     if not term:
         raise HTTPException(status_code=404, detail="Term not found")
     
-    is_correct = term.term.lower().strip() == answer.user_answer.lower().strip()
+    result = grade_answer(catalog, term, answer.user_answer)
+    run_write(db, lambda session: record_review(session, current_user.id, term.id, result["correct"]))
+    record_answers(current_user.id, [(term.id, result["correct"], answer.response_ms)])
+    return result
+
+@router.post("/check-batch", response_model=schemas.BatchAnswerResponse)
+def check_answers_batch(
+    batch: schemas.BatchAnswer,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Grade a whole quiz and save its score in one request (requires authentication)"""
+    catalog = get_catalog(db)
     
-    return {
-        "correct": is_correct,
-        "correct_answer": term.term,
-        "real_world": term.real_world
-    }
\ No newline at end of file
+    results = []
+    for answer in batch.answers:
+        term = catalog.get(answer.term_id)
+        if not term:
+            raise HTTPException(status_code=404, detail=f"Term {answer.term_id} not found")
+        results.append({"term_id": term.id, **grade_answer(catalog, term, answer.user_answer)})
+    
+    correct = sum(1 for r in results if r["correct"])
+    
+    def save(session: Session):
+        for r in results:
+            record_review(session, current_user.id, r["term_id"], r["correct"])
+        return add_score(session, current_user.id, correct, len(results))
+    
+    score = run_write(db, save)
+    record_answers(
+        current_user.id,
+        [(r["term_id"], r["correct"], a.response_ms) for r, a in zip(results, batch.answers)]
+    )
+    db.refresh(score)
+    
+    return {"results": results, "score": score}
\ No newline at end of file
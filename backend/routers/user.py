@@ -1,11 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from concurrent.futures import TimeoutError as FutureTimeout
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 import models
 import schemas
-from database import get_db
-from auth_utils import get_current_user
+from database import get_db, get_read_db, run_write
+from auth_utils import Principal, get_current_user
+from term_cache import get_catalog
+import stats
+from config import settings
+from scores import ScoreSubmission, add_score, score_percentage, score_queue
+from write_behind import QueueFull
+from search import search_term_ids
+from http_cache import cached_json_response, catalog_body, term_body
+import leaderboard
+import progress
+from pagination import MAX_PAGE_SIZE, keyset_list
 
 router = APIRouter(
     prefix="/api",
@@ -14,68 +27,120 @@ router = APIRouter(
 
 @router.get("/terms", response_model=List[schemas.TermResponse])
 def get_all_terms(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Get all terms; supports If-None-Match (requires authentication)"""
+    return cached_json_response(request, catalog_body(get_catalog(db)))
+
+@router.get("/terms/search", response_model=List[schemas.TermResponse])
+def search_terms(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
-    """Get all terms (requires authentication)"""
-    terms = db.query(models.Term).all()
-    return terms
+    """Ranked search across term, definition, example and real_world (requires authentication)"""
+    catalog = get_catalog(db)
+    results = (catalog.get(term_id) for term_id in search_term_ids(db, q, limit))
+    return [term for term in results if term is not None]
 
 @router.get("/terms/{term_id}", response_model=schemas.TermResponse)
 def get_term(
     term_id: int,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
-    """Get a specific term by ID (requires authentication)"""
-    term = db.query(models.Term).filter(models.Term.id == term_id).first()
-    if not term:
+    """Get a specific term by ID; supports If-None-Match (requires authentication)"""
+    cached = term_body(get_catalog(db), term_id)
+    if not cached:
         raise HTTPException(status_code=404, detail="Term not found")
-    return term
+    return cached_json_response(request, cached)
 
 @router.post("/scores", response_model=schemas.ScoreResponse)
 def save_score(
     score_data: schemas.ScoreCreate,
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Save user score (requires authentication)"""
-    percentage = round((score_data.correct / score_data.total * 100) if score_data.total > 0 else 0, 2)
+    if settings.score_write_mode != "direct":
+        submission, future = enqueue_score(current_user.id, score_data)
+        if settings.score_write_mode == "group":
+            try:
+                return future.result(timeout=group_commit_timeout())
+            except (FutureTimeout, RuntimeError):
+                raise score_unavailable()
+        return accepted_score(submission)
     
-    new_score = models.UserScore(
-        user_id=current_user.id,
-        correct=score_data.correct,
-        total=score_data.total,
-        percentage=percentage
+    new_score = run_write(
+        db,
+        lambda session: add_score(session, current_user.id, score_data.correct, score_data.total)
     )
-    
-    db.add(new_score)
-    db.commit()
     db.refresh(new_score)
     
     return new_score
 
+def enqueue_score(user_id: int, score_data: schemas.ScoreCreate):
+    submission = ScoreSubmission(user_id, score_data.correct, score_data.total, datetime.utcnow())
+    try:
+        return submission, score_queue.submit(submission)
+    except QueueFull:
+        raise score_unavailable("Score queue is full, please retry")
+    except RuntimeError:  # closed for shutdown
+        raise score_unavailable()
+
+def group_commit_timeout() -> float:
+    """How long a group-mode request waits for its batch to commit"""
+    return settings.score_queue_max_delay_ms / 1000 + settings.score_queue_wait_margin_seconds
+
+def score_unavailable(detail: str = "Score could not be saved, please retry") -> HTTPException:
+    """503 for a queued score that was refused, failed or not committed in time"""
+    return HTTPException(status_code=503, detail=detail, headers={"Retry-After": "1"})
+
+def accepted_score(submission: ScoreSubmission) -> JSONResponse:
+    """202 for a write-behind score; the id is assigned when its batch commits"""
+    return JSONResponse(status_code=202, content={
+        "id": None,
+        "user_id": submission.user_id,
+        "correct": submission.correct,
+        "total": submission.total,
+        "percentage": score_percentage(submission.correct, submission.total),
+        "created_at": submission.submitted_at.isoformat()
+    })
+
 @router.get("/scores/my-history", response_model=List[schemas.ScoreResponse])
 def get_my_scores(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
-    """Get current user's score history (requires authentication)"""
-    scores = db.query(models.UserScore).filter(
-        models.UserScore.user_id == current_user.id
-    ).order_by(models.UserScore.created_at.desc()).all()
-    
-    return scores
+    """Get current user's score history, newest first (requires authentication)"""
+    return keyset_list(
+        db,
+        lambda session: session.query(models.UserScore).filter(
+            models.UserScore.user_id == current_user.id
+        ),
+        (models.UserScore.created_at, models.UserScore.id),
+        schemas.ScoreResponse,
+        response, limit, cursor, stream
+    )
 
 @router.get("/stats")
 def get_stats(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get overall statistics (requires authentication)"""
-    all_scores = db.query(models.UserScore).all()
-    
-    if not all_scores:
+    return stats_payload(stats.get_summary(db))
+
+def stats_payload(summary: models.StatsSummary) -> dict:
+    if not summary.total_quizzes:
         return {
             "total_users": 0,
             "total_quizzes": 0,
@@ -83,11 +148,28 @@ def get_stats(
             "total_questions_answered": 0
         }
     
-    total_users = db.query(models.User).count()
-    
     return {
-        "total_users": total_users,
-        "total_quizzes": len(all_scores),
-        "average_score": round(sum(s.percentage for s in all_scores) / len(all_scores), 2),
-        "total_questions_answered": sum(s.total for s in all_scores)
-    }
\ No newline at end of file
+        "total_users": summary.total_users,
+        "total_quizzes": summary.total_quizzes,
+        "average_score": round(summary.percentage_sum / summary.total_quizzes, 2),
+        "total_questions_answered": summary.total_questions
+    }
+
+@router.get("/stats/me")
+def get_my_stats(
+    days: int = Query(14, ge=1, le=90),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Current user's averages, best score, streak and trend (requires authentication)"""
+    return progress.user_progress(db, current_user.id, days)
+
+@router.get("/leaderboard")
+def get_leaderboard(
+    period: str = Query(leaderboard.ALL_TIME, pattern="^(all|weekly)$"),
+    limit: int = Query(10, ge=1, le=100),
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Top players plus the caller's own rank (requires authentication)"""
+    return leaderboard.standings(db, period, limit, current_user.id)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 from datetime import datetime
 
@@ -77,13 +77,24 @@ class QuizQuestion(BaseModel):
 
 class Answer(BaseModel):
     term_id: int
-    user_answer: str
+    user_answer: str = Field(..., max_length=200)
+    # Time from showing the question to submitting, measured by the client
+    response_ms: Optional[int] = Field(None, ge=0, le=3_600_000)
 
 
 class AnswerResponse(BaseModel):
     correct: bool
     correct_answer: str
     real_world: str
+    suggestion: Optional[str] = None
+
+
+class BatchAnswer(BaseModel):
+    answers: List[Answer] = Field(..., min_length=1, max_length=100)
+
+
+class BatchAnswerResult(AnswerResponse):
+    term_id: int
 
 
 # ================= SCORE SCHEMAS =================
@@ -103,3 +114,8 @@ class ScoreResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BatchAnswerResponse(BaseModel):
+    results: List[BatchAnswerResult]
+    score: ScoreResponse
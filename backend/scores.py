@@ -0,0 +1,81 @@
+"""Shared write path for quiz scores.
+
+Every route that records a finished quiz goes through ``add_score`` or
+``add_scores`` so the derived aggregates stay in step with ``user_scores``.
+With ``score_write_mode`` set to ``group`` or ``write_behind``,
+``/api/scores`` hands submissions to ``score_queue``, which commits them in
+batches.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Sequence
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal
+from models import UserScore
+from write_behind import WriteBehindQueue
+import leaderboard
+import progress
+import stats
+
+
+def score_percentage(correct: int, total: int) -> float:
+    return round((correct / total * 100) if total > 0 else 0, 2)
+
+
+def add_score(db: Session, user_id: int, correct: int, total: int) -> UserScore:
+    """Stage a UserScore and its aggregate updates (caller commits)"""
+    score = UserScore(
+        user_id=user_id,
+        correct=correct,
+        total=total,
+        percentage=score_percentage(correct, total)
+    )
+    db.add(score)
+    stats.record_score(db, score)
+    leaderboard.record_score(db, user_id, correct, score.percentage)
+    progress.record_score(db, user_id, correct, total, score.percentage)
+    return score
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreSubmission:
+    user_id: int
+    correct: int
+    total: int
+    submitted_at: datetime
+
+
+def add_scores(db: Session, submissions: Sequence[ScoreSubmission]) -> List[UserScore]:
+    """Stage many scores with one summary update (caller commits)"""
+    scores = [
+        UserScore(
+            user_id=s.user_id,
+            correct=s.correct,
+            total=s.total,
+            percentage=score_percentage(s.correct, s.total),
+            created_at=s.submitted_at
+        )
+        for s in submissions
+    ]
+    db.add_all(scores)
+    stats.record_scores(db, scores)
+    for score in scores:
+        leaderboard.record_score(db, score.user_id, score.correct, score.percentage, now=score.created_at)
+        progress.record_score(db, score.user_id, score.correct, score.total, score.percentage,
+                              now=score.created_at)
+    db.flush()
+    return scores
+
+
+score_queue: WriteBehindQueue[ScoreSubmission] = WriteBehindQueue(
+    "scores",
+    add_scores,
+    max_batch=settings.score_queue_max_batch,
+    max_delay=settings.score_queue_max_delay_ms / 1000,
+    max_pending=settings.score_queue_max_pending,
+    # Results are read after the flusher's session has closed
+    session_factory=lambda: SessionLocal(expire_on_commit=False)
+)
@@ -0,0 +1,105 @@
+"""Ranked full-text search over the term catalog.
+
+On SQLite the index is an external-content FTS5 table over ``terms``
+kept in sync by triggers, so admin create/update/delete, bulk upserts and
+raw SQL edits all update it in the same transaction. Results are ranked
+with bm25, weighting a hit in ``term`` above ``definition`` above
+``example``/``real_world``. Other databases fall back to a scan of the
+cached catalog.
+"""
+import re
+from typing import List
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from term_cache import get_catalog
+
+# bm25 column weights: term, definition, example, real_world
+COLUMN_WEIGHTS = (10.0, 3.0, 1.0, 1.0)
+
+_FTS_SETUP = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS terms_fts USING fts5(
+        term, definition, example, real_world,
+        content='terms', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS terms_fts_ai AFTER INSERT ON terms BEGIN
+        INSERT INTO terms_fts(rowid, term, definition, example, real_world)
+        VALUES (new.id, new.term, new.definition, new.example, new.real_world);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS terms_fts_ad AFTER DELETE ON terms BEGIN
+        INSERT INTO terms_fts(terms_fts, rowid, term, definition, example, real_world)
+        VALUES ('delete', old.id, old.term, old.definition, old.example, old.real_world);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS terms_fts_au AFTER UPDATE ON terms BEGIN
+        INSERT INTO terms_fts(terms_fts, rowid, term, definition, example, real_world)
+        VALUES ('delete', old.id, old.term, old.definition, old.example, old.real_world);
+        INSERT INTO terms_fts(rowid, term, definition, example, real_world)
+        VALUES (new.id, new.term, new.definition, new.example, new.real_world);
+    END
+    """,
+)
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the FTS5 table and triggers, backfilling on first creation"""
+    if engine.dialect.name != "sqlite":
+        return
+    existed = inspect(engine).has_table("terms_fts")
+    with engine.begin() as conn:
+        for statement in _FTS_SETUP:
+            conn.execute(text(statement))
+        if not existed:
+            conn.execute(text("INSERT INTO terms_fts(terms_fts) VALUES ('rebuild')"))
+
+
+def _tokens(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def search_term_ids(db: Session, query: str, limit: int) -> List[int]:
+    """Return ids of terms matching every word of query (as prefixes), best first"""
+    tokens = _tokens(query)
+    if not tokens:
+        return []
+
+    if db.get_bind().dialect.name != "sqlite":
+        return _scan_catalog(db, tokens, limit)
+
+    # Single characters are matched exactly; as prefixes they hit most rows
+    match = " ".join(f'"{token}"*' if len(token) > 1 else f'"{token}"' for token in tokens)
+    weights = ", ".join(str(w) for w in COLUMN_WEIGHTS)
+    rows = db.execute(
+        text(
+            f"SELECT rowid FROM terms_fts WHERE terms_fts MATCH :match "
+            f"ORDER BY bm25(terms_fts, {weights}) LIMIT :limit"
+        ),
+        {"match": match, "limit": limit}
+    )
+    return [row[0] for row in rows]
+
+
+def _scan_catalog(db: Session, tokens: List[str], limit: int) -> List[int]:
+    scored = []
+    for t in get_catalog(db).terms:
+        fields = (t.term, t.definition, t.example, t.real_world)
+        words = [set(_tokens(f)) for f in fields]
+        score = 0.0
+        for token in tokens:
+            hits = [w for f, w in zip(words, COLUMN_WEIGHTS) if any(x.startswith(token) for x in f)]
+            if not hits:
+                break
+            score += max(hits)
+        else:
+            scored.append((-score, t.id))
+    scored.sort()
+    return [term_id for _, term_id in scored[:limit]]
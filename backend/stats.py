@@ -0,0 +1,107 @@
+"""Incrementally maintained totals for /api/stats.
+
+Writers call ``record_user``/``record_score`` inside their own transaction,
+so the summary commits (or rolls back) together with the row it counts.
+Run ``python stats.py`` to recompute the summary, the leaderboard entries
+and the per-user daily rollups from the raw tables.
+"""
+from typing import List
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import StatsSummary, User, UserScore
+
+SUMMARY_ID = 1
+
+
+def _bump(db: Session, **deltas) -> None:
+    values = {
+        getattr(StatsSummary, name): getattr(StatsSummary, name) + delta
+        for name, delta in deltas.items()
+    }
+    updated = db.query(StatsSummary).filter(
+        StatsSummary.id == SUMMARY_ID
+    ).update(values, synchronize_session=False)
+
+    if not updated:
+        # No summary yet: count the pending row as part of a full rebuild
+        db.flush()
+        rebuild_stats(db)
+
+
+def record_user(db: Session) -> None:
+    _bump(db, total_users=1)
+
+
+def record_score(db: Session, score: UserScore) -> None:
+    record_scores(db, [score])
+
+
+def record_scores(db: Session, scores: List[UserScore]) -> None:
+    _bump(
+        db,
+        total_quizzes=len(scores),
+        percentage_sum=sum(score.percentage for score in scores),
+        total_questions=sum(score.total for score in scores)
+    )
+
+
+def _compute(db: Session) -> StatsSummary:
+    quizzes, percentage_sum, questions = db.query(
+        func.count(UserScore.id),
+        func.coalesce(func.sum(UserScore.percentage), 0.0),
+        func.coalesce(func.sum(UserScore.total), 0)
+    ).one()
+
+    return StatsSummary(
+        id=SUMMARY_ID,
+        total_users=db.query(func.count(User.id)).scalar(),
+        total_quizzes=quizzes,
+        percentage_sum=percentage_sum,
+        total_questions=questions
+    )
+
+
+def rebuild_stats(db: Session) -> StatsSummary:
+    """Recompute the summary from users/user_scores (caller commits)"""
+    return db.merge(_compute(db))
+
+
+def ensure_summary(db: Session) -> None:
+    if db.get(StatsSummary, SUMMARY_ID) is None:
+        rebuild_stats(db)
+        db.commit()
+
+
+def get_summary(db: Session) -> StatsSummary:
+    """Read the summary; safe on a read-only session"""
+    summary = db.get(StatsSummary, SUMMARY_ID)
+    if summary is None:
+        # init_db normally creates the row; compute it without persisting
+        summary = _compute(db)
+    return summary
+
+
+if __name__ == "__main__":
+    from database import SessionLocal, Base, engine
+
+    Base.metadata.create_all(bind=engine)
+    from leaderboard import rebuild_leaderboard
+    from progress import rebuild_progress
+
+    db = SessionLocal()
+    try:
+        summary = rebuild_stats(db)
+        entries = rebuild_leaderboard(db)
+        days = rebuild_progress(db)
+        db.commit()
+        print(
+            f"✅ Stats rebuilt: {summary.total_users} users, "
+            f"{summary.total_quizzes} quizzes, "
+            f"{summary.total_questions} questions answered, "
+            f"{entries} leaderboard entries, "
+            f"{days} user-days"
+        )
+    finally:
+        db.close()
@@ -0,0 +1,259 @@
+import random
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from models import Term
+
+# ================= RECORDS =================
+
+@dataclass(frozen=True, slots=True)
+class TermRecord:
+    """Immutable, detached copy of a Term row"""
+    id: int
+    term: str
+    definition: str
+    example: str
+    real_world: str
+    difficulty: str
+    created_at: datetime
+    updated_at: datetime
+
+
+def normalize_term(value: str) -> str:
+    return value.lower().strip()
+
+
+class TermCatalog:
+    """Snapshot of the whole Term table indexed by id and normalized term"""
+
+    __slots__ = ("version", "terms", "by_id", "by_term", "by_difficulty", "_derived", "_derived_lock")
+
+    def __init__(self, version: int, terms: Tuple[TermRecord, ...]):
+        self.version = version
+        self.terms = terms
+        self.by_id: Dict[int, TermRecord] = {t.id: t for t in terms}
+        self.by_term: Dict[str, TermRecord] = {normalize_term(t.term): t for t in terms}
+
+        buckets: Dict[str, List[TermRecord]] = {}
+        for t in terms:
+            buckets.setdefault(t.difficulty, []).append(t)
+        self.by_difficulty: Dict[str, Tuple[TermRecord, ...]] = {
+            difficulty: tuple(records) for difficulty, records in buckets.items()
+        }
+        self._derived: Dict[str, Any] = {}
+        self._derived_lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def derived(self, key: str, build: Callable[["TermCatalog"], Any]) -> Any:
+        """Memoize a structure computed from this snapshot; it is dropped
+        together with the snapshot when the catalog version changes.
+
+        Each value is built once: concurrent callers wait for the first
+        build instead of repeating it.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._derived_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = self._derived[key] = build(self)
+        return value
+
+    def get(self, term_id: int) -> Optional[TermRecord]:
+        return self.by_id.get(term_id)
+
+    def find(self, term: str) -> Optional[TermRecord]:
+        return self.by_term.get(normalize_term(term))
+
+    def sample(
+        self,
+        k: int,
+        difficulty: Optional[str] = None,
+        weights: Optional[Dict[str, float]] = None
+    ) -> List[TermRecord]:
+        """Pick up to k distinct terms in O(k), independent of catalog size.
+
+        ``difficulty`` restricts the draw to one bucket. ``weights`` maps a
+        difficulty to the relative weight of each of its terms; difficulties
+        missing from the mapping are left out.
+        """
+        if difficulty is not None:
+            pools = {difficulty: self.by_difficulty.get(difficulty, ())}
+        elif weights:
+            pools = self.by_difficulty
+        else:
+            pools = {None: self.terms}
+
+        if weights:
+            pools = {d: p for d, p in pools.items() if weights.get(d, 0) > 0}
+        pools = {d: p for d, p in pools.items() if p}
+        if not pools or k <= 0:
+            return []
+
+        if len(pools) == 1:
+            (pool,) = pools.values()
+            return [pool[i] for i in random.sample(range(len(pool)), min(k, len(pool)))]
+        return _weighted_sample(k, pools, weights)
+
+
+def _weighted_sample(
+    k: int,
+    pools: Dict[str, Tuple[TermRecord, ...]],
+    weights: Dict[str, float]
+) -> List[TermRecord]:
+    """Draw without replacement where every term in pool d weighs weights[d]"""
+    # Only ratios matter; scaling by the largest keeps weight * pool size finite
+    top = max(weights[d] for d in pools)
+    scale = {d: weights[d] / top for d in pools}
+    taken: Dict[str, set] = {d: set() for d in pools}
+    # Indices not yet drawn, built once a pool is half drawn and rejection gets slow
+    left: Dict[str, List[int]] = {}
+    k = min(k, sum(len(p) for p in pools.values()))
+    selected: List[TermRecord] = []
+
+    while len(selected) < k:
+        names = list(pools)
+        mass = [scale[d] * (len(pools[d]) - len(taken[d])) for d in names]
+        d = random.choices(names, weights=mass)[0]
+
+        pool, seen = pools[d], taken[d]
+        if 2 * len(seen) < len(pool):
+            i = random.randrange(len(pool))
+            while i in seen:
+                i = random.randrange(len(pool))
+        else:
+            rest = left.get(d)
+            if rest is None:
+                rest = left[d] = [i for i in range(len(pool)) if i not in seen]
+            j = random.randrange(len(rest))
+            rest[j], rest[-1] = rest[-1], rest[j]
+            i = rest.pop()
+        seen.add(i)
+        selected.append(pool[i])
+
+    return selected
+
+# ================= CACHE =================
+
+_lock = threading.Lock()
+_version = 0
+_catalog: Optional[TermCatalog] = None
+
+
+def current_version() -> int:
+    if settings.term_snapshot_dir:
+        catalog = _snapshots().current()
+        return catalog.version if catalog is not None else 0
+    return _version
+
+
+def invalidate() -> int:
+    """Bump the catalog version; call after every committed Term write.
+
+    With ``term_snapshot_dir`` set this publishes a new shared snapshot,
+    which every worker picks up on its next lookup.
+    """
+    global _version
+    with _lock:
+        _version += 1
+        version = _version
+    if settings.term_snapshot_dir:
+        return publish_snapshot()
+    return version
+
+
+_CATALOG_COLUMNS = (
+    Term.id, Term.term, Term.definition, Term.example,
+    Term.real_world, Term.difficulty, Term.created_at, Term.updated_at
+)
+
+
+def _build(version: int, rows) -> TermCatalog:
+    return TermCatalog(version, tuple(TermRecord(*row) for row in rows))
+
+
+def _load(db: Session, version: int) -> TermCatalog:
+    return _build(version, db.query(*_CATALOG_COLUMNS).order_by(Term.id).all())
+
+
+def _publish(version: int, catalog: TermCatalog) -> None:
+    global _catalog
+    with _lock:
+        # A write may have landed while we were loading; only publish
+        # the snapshot if it is still current.
+        if version == _version:
+            _catalog = catalog
+
+
+def get_catalog(db: Session) -> TermCatalog:
+    """Return the cached catalog, reloading it from db if it is stale"""
+    if settings.term_snapshot_dir:
+        catalog = _snapshots().current()
+        if catalog is None:
+            publish_snapshot()
+            catalog = _snapshots().current()
+        return catalog
+
+    catalog = _catalog
+    if catalog is not None and catalog.version == _version:
+        return catalog
+
+    version = _version
+    catalog = _load(db, version)
+    _publish(version, catalog)
+    return catalog
+
+
+async def get_catalog_async(db: AsyncSession) -> TermCatalog:
+    """get_catalog for the async stack; rebuilds run off the event loop"""
+    if settings.term_snapshot_dir:
+        catalog = _snapshots().current()
+        # The first publish reads the table through the sync engine
+        return catalog if catalog is not None else await run_in_threadpool(get_catalog, None)
+
+    catalog = _catalog
+    if catalog is not None and catalog.version == _version:
+        return catalog
+
+    version = _version
+    rows = (await db.execute(select(*_CATALOG_COLUMNS).order_by(Term.id))).all()
+    catalog = await run_in_threadpool(_build, version, rows)
+    _publish(version, catalog)
+    return catalog
+
+# ================= SHARED SNAPSHOT =================
+
+_reader = None
+
+
+def _snapshots():
+    global _reader
+    if _reader is None:
+        from term_snapshot import SnapshotReader
+        _reader = SnapshotReader(settings.term_snapshot_dir)
+    return _reader
+
+
+def publish_snapshot() -> int:
+    """Publish the committed Term table as the next snapshot generation"""
+    from database import SessionLocal
+    from term_snapshot import publish
+
+    def load():
+        db = SessionLocal()
+        try:
+            return _load(db, 0).terms
+        finally:
+            db.close()
+
+    return publish(settings.term_snapshot_dir, load)
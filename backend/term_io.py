@@ -0,0 +1,234 @@
+"""Streaming bulk import/export of terms.
+
+Input may be a JSON array (the ``data/terms.json`` layout) or NDJSON; it is
+parsed incrementally so memory stays bounded by the chunk size, not the
+file size. Field names are mapped to the model (``realWorld`` ->
+``real_world``) and unknown keys such as ``id`` are dropped. Each chunk is
+upserted on ``Term.term`` with one executemany in its own transaction.
+
+    python term_io.py import data/terms.json
+    python term_io.py export terms.ndjson --format ndjson
+
+A CLI import can only invalidate the term cache of its own process. Servers
+running with ``term_snapshot_dir`` pick up the snapshot it publishes; without
+it they keep serving the old catalog (and its ETags) until restarted. Imports
+through ``POST /api/admin/terms/import`` have no such caveat.
+"""
+import argparse
+import codecs
+import json
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List
+
+from config import settings
+from database import ReadSessionLocal, engine, upsert_insert
+from models import Term
+import term_cache
+
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+READ_SIZE = 64 * 1024
+MAX_ELEMENT_SIZE = 1024 * 1024
+
+TERM_FIELDS = ("term", "definition", "example", "real_world", "difficulty")
+FIELD_ALIASES = {"realWorld": "real_world"}
+CAMEL_FIELDS = {model: alias for alias, model in FIELD_ALIASES.items()}
+
+# ================= PARSING =================
+
+def normalize_record(raw: dict) -> Dict[str, str]:
+    """Map a raw import object onto Term columns"""
+    if not isinstance(raw, dict):
+        raise ValueError("Each term must be a JSON object")
+    record = {}
+    for key, value in raw.items():
+        field = FIELD_ALIASES.get(key, key)
+        if field in TERM_FIELDS:
+            record[field] = value
+    missing = [f for f in TERM_FIELDS if not isinstance(record.get(f), str) or not record[f]]
+    if missing:
+        raise ValueError(f"Term {raw.get('term')!r} is missing {', '.join(missing)}")
+    return record
+
+
+class TermStreamParser:
+    """Incremental parser for a JSON array of objects or NDJSON"""
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._mode = None  # "array" | "ndjson"
+        self._done = False
+
+    def feed(self, data: bytes) -> List[Dict[str, str]]:
+        self._buffer += self._text.decode(data)
+        return self._drain(final=False)
+
+    def close(self) -> List[Dict[str, str]]:
+        self._buffer += self._text.decode(b"", final=True)
+        records = self._drain(final=True)
+        if self._mode == "array" and not self._done:
+            raise ValueError("Invalid or unterminated JSON array")
+        return records
+
+    def _drain(self, final: bool) -> List[Dict[str, str]]:
+        if self._mode is None:
+            stripped = self._buffer.lstrip()
+            if not stripped:
+                return []
+            if stripped[0] == "[":
+                self._mode = "array"
+                self._buffer = stripped[1:]
+            else:
+                self._mode = "ndjson"
+        if self._mode == "array":
+            return self._drain_array()
+        return self._drain_ndjson(final)
+
+    def _drain_ndjson(self, final: bool) -> List[Dict[str, str]]:
+        *lines, self._buffer = self._buffer.split("\n")
+        if final:
+            lines.append(self._buffer)
+            self._buffer = ""
+        records = []
+        for line in lines:
+            if line.strip():
+                try:
+                    records.append(normalize_record(json.loads(line)))
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"Invalid NDJSON line: {exc}")
+        return records
+
+    def _drain_array(self) -> List[Dict[str, str]]:
+        records = []
+        buffer, pos = self._buffer, 0
+        while not self._done:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                break
+            try:
+                obj, pos = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as exc:
+                # Usually an element split across chunks; wait for more data
+                if len(buffer) - pos > MAX_ELEMENT_SIZE:
+                    raise ValueError(f"Invalid JSON array element: {exc}")
+                break
+            records.append(normalize_record(obj))
+        self._buffer = "" if self._done else buffer[pos:]
+        return records
+
+
+def iter_file_records(path: str) -> Iterator[Dict[str, str]]:
+    parser = TermStreamParser()
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(READ_SIZE)
+            if not data:
+                break
+            yield from parser.feed(data)
+    yield from parser.close()
+
+# ================= IMPORT =================
+
+def upsert_terms(records: List[Dict[str, str]]) -> int:
+    """Upsert one chunk on Term.term in a single transaction"""
+    if not records:
+        return 0
+    # Last occurrence wins when a chunk repeats a term
+    unique = list({r["term"]: r for r in records}.values())
+
+    stmt = upsert_insert(engine)(Term.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Term.term],
+        set_={
+            **{f: stmt.excluded[f] for f in TERM_FIELDS if f != "term"},
+            "updated_at": datetime.utcnow(),
+        }
+    )
+    with engine.begin() as conn:
+        conn.execute(stmt, unique)
+    return len(unique)
+
+
+def import_records(records: Iterable[Dict[str, str]], chunk_size: int = IMPORT_CHUNK_SIZE) -> int:
+    total = 0
+    chunk = []
+    try:
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                total += upsert_terms(chunk)
+                chunk = []
+        total += upsert_terms(chunk)
+    finally:
+        term_cache.invalidate()
+    return total
+
+# ================= EXPORT =================
+
+def _export_dict(row, style: str) -> dict:
+    data = {"id": row.id}
+    for field in TERM_FIELDS:
+        key = CAMEL_FIELDS.get(field, field) if style == "camel" else field
+        data[key] = getattr(row, field)
+    return data
+
+
+def iter_export(fmt: str = "ndjson", style: str = "model") -> Iterator[str]:
+    """Yield the catalog as NDJSON lines or JSON array pieces, in id order"""
+    db = ReadSessionLocal()
+    try:
+        rows = db.query(Term.id, *(getattr(Term, f) for f in TERM_FIELDS)).order_by(
+            Term.id
+        ).yield_per(EXPORT_BATCH_SIZE)
+
+        if fmt == "ndjson":
+            for row in rows:
+                yield json.dumps(_export_dict(row, style), ensure_ascii=False) + "\n"
+            return
+
+        first = True
+        yield "["
+        for row in rows:
+            yield ("\n  " if first else ",\n  ") + json.dumps(_export_dict(row, style), ensure_ascii=False)
+            first = False
+        yield "\n]\n"
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import/export terms")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    import_help = (
+        "Upsert terms from a JSON array or NDJSON file; restart running servers "
+        "afterwards unless they share TECH_VOCAB_TERM_SNAPSHOT_DIR"
+    )
+    imp = sub.add_parser("import", help=import_help, description=import_help)
+    imp.add_argument("path", nargs="?", default="data/terms.json")
+    imp.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+
+    exp = sub.add_parser("export", help="Write the catalog to a file")
+    exp.add_argument("path")
+    exp.add_argument("--format", choices=["ndjson", "json"], default="ndjson")
+    exp.add_argument("--style", choices=["model", "camel"], default="model")
+
+    args = parser.parse_args()
+    if args.command == "import":
+        from database import Base
+        Base.metadata.create_all(bind=engine)
+        count = import_records(iter_file_records(args.path), args.chunk_size)
+        print(f"✅ Imported {count} terms from {args.path}")
+        if not settings.term_snapshot_dir:
+            print("📝 Restart running servers to serve the imported terms")
+    else:
+        with open(args.path, "w", encoding="utf-8") as out:
+            for piece in iter_export(args.format, args.style):
+                out.write(piece)
+        print(f"✅ Exported terms to {args.path}")
@@ -0,0 +1,282 @@
+"""Memory-mapped term catalog shared by every worker process.
+
+When ``settings.term_snapshot_dir`` is set, each committed Term write
+publishes an immutable binary snapshot of the whole table and bumps the
+generation in ``CURRENT``. Workers ``mmap`` the current file read-only and
+decode records on access, so the catalog lives once in the page cache no
+matter how many workers run. A worker notices a new generation with one
+``stat`` of ``CURRENT`` per lookup.
+
+File layout (little-endian)::
+
+    header      magic, format, count, generation, meta length
+    meta        JSON: {"buckets": {difficulty: [start, count]}}
+    offsets     (count + 1) x u64   record i is bytes offsets[i]:offsets[i+1]
+    ids         count x i64         ascending; record i has ids[i]
+    term_order  count x u32         record indices ordered by normalized term
+    buckets     count x u32         record indices grouped by difficulty
+    records     per record: 7 x u32 field lengths, then the UTF-8 fields
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+from bisect import bisect_left
+from collections.abc import Sequence
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from term_cache import TermCatalog, TermRecord, normalize_term
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process dev servers only
+    fcntl = None
+
+MAGIC = b"TVTERMS\x00"
+FORMAT = 1
+HEADER = struct.Struct("<8sIIQI4x")
+FIELD_LENGTHS = struct.Struct("<7I")
+CURRENT_FILE = "CURRENT"
+KEEP_GENERATIONS = 3
+
+# ================= WRITING =================
+
+def _pad8(data: bytearray) -> None:
+    data.extend(b"\x00" * (-len(data) % 8))
+
+
+def _encode_record(t: TermRecord) -> bytes:
+    fields = [
+        t.term, t.definition, t.example, t.real_world, t.difficulty,
+        t.created_at.isoformat() if t.created_at else "",
+        t.updated_at.isoformat() if t.updated_at else "",
+    ]
+    encoded = [f.encode() for f in fields]
+    return FIELD_LENGTHS.pack(*map(len, encoded)) + b"".join(encoded)
+
+
+def encode_snapshot(terms: Iterable[TermRecord], generation: int) -> bytes:
+    terms = sorted(terms, key=lambda t: t.id)
+    count = len(terms)
+
+    buckets: Dict[str, list] = {}
+    for index, t in enumerate(terms):
+        buckets.setdefault(t.difficulty, []).append(index)
+    meta, start = {}, 0
+    for difficulty, indices in buckets.items():
+        meta[difficulty] = [start, len(indices)]
+        start += len(indices)
+    meta_bytes = json.dumps({"buckets": meta}).encode()
+
+    records = [_encode_record(t) for t in terms]
+    term_order = sorted(range(count), key=lambda i: normalize_term(terms[i].term))
+
+    data = bytearray(HEADER.pack(MAGIC, FORMAT, count, generation, len(meta_bytes)))
+    data += meta_bytes
+    _pad8(data)
+    records_start = len(data) + 8 * (count + 1) + 8 * count + 4 * count * 2
+    records_start += -records_start % 8
+
+    offsets, position = [], records_start
+    for record in records:
+        offsets.append(position)
+        position += len(record)
+    offsets.append(position)
+
+    data += struct.pack(f"<{count + 1}Q", *offsets)
+    data += struct.pack(f"<{count}q", *(t.id for t in terms))
+    data += struct.pack(f"<{count}I", *term_order)
+    data += struct.pack(f"<{count}I", *(i for indices in buckets.values() for i in indices))
+    _pad8(data)
+    for record in records:
+        data += record
+    return bytes(data)
+
+
+def snapshot_path(directory: str, generation: int) -> str:
+    return os.path.join(directory, f"terms-{generation}.snap")
+
+
+def read_generation(directory: str) -> int:
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            return int(f.read().strip() or 0)
+    except FileNotFoundError:
+        return 0
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _publish_lock(directory: str):
+    with open(os.path.join(directory, ".lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def publish(directory: str, load: Callable[[], Iterable[TermRecord]]) -> int:
+    """Write a new generation from load() and point CURRENT at it.
+
+    Publishers are serialized across processes and load the rows inside
+    the lock, so the newest generation always includes every write that
+    committed before its publish started.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with _publish_lock(directory):
+        generation = read_generation(directory) + 1
+        _write_atomic(snapshot_path(directory, generation), encode_snapshot(load(), generation))
+        _write_atomic(os.path.join(directory, CURRENT_FILE), str(generation).encode())
+
+        # Unlinked files stay valid for workers that still have them mapped
+        for old in range(generation - KEEP_GENERATIONS, 0, -1):
+            try:
+                os.remove(snapshot_path(directory, old))
+            except FileNotFoundError:
+                break
+            except OSError:
+                pass
+    return generation
+
+# ================= READING =================
+
+class _RecordView(Sequence):
+    """Lazy sequence of records selected by an index array"""
+
+    __slots__ = ("_catalog", "_indices")
+
+    def __init__(self, catalog: "SnapshotCatalog", indices):
+        self._catalog = catalog
+        self._indices = indices
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._catalog.record(j) for j in self._indices[i]]
+        return self._catalog.record(self._indices[i])
+
+
+class SnapshotCatalog(TermCatalog):
+    """TermCatalog over a mapped snapshot; records are decoded on access"""
+
+    __slots__ = ("_mmap", "_view", "_offsets", "_ids", "_term_order")
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = self._view = memoryview(self._mmap)
+
+        magic, fmt, count, generation, meta_len = HEADER.unpack_from(view)
+        if magic != MAGIC or fmt != FORMAT:
+            raise ValueError(f"{path} is not a term snapshot")
+        meta = json.loads(bytes(view[HEADER.size:HEADER.size + meta_len]))
+
+        position = HEADER.size + meta_len
+        position += -position % 8
+
+        def array(fmt: str, n: int, size: int):
+            nonlocal position
+            arr = view[position:position + n * size].cast(fmt)
+            position += n * size
+            return arr
+
+        self._offsets = array("Q", count + 1, 8)
+        self._ids = array("q", count, 8)
+        self._term_order = array("I", count, 4)
+        bucket_indices = array("I", count, 4)
+
+        self.version = generation
+        self.terms = _RecordView(self, range(count))
+        self.by_difficulty = {
+            difficulty: _RecordView(self, bucket_indices[start:start + n])
+            for difficulty, (start, n) in meta["buckets"].items()
+        }
+        self._derived = {}
+        self._derived_lock = threading.RLock()
+
+    def record(self, index: int) -> TermRecord:
+        start = self._offsets[index]
+        lengths = FIELD_LENGTHS.unpack_from(self._view, start)
+        position = start + FIELD_LENGTHS.size
+        fields = []
+        for length in lengths:
+            fields.append(str(self._view[position:position + length], "utf-8"))
+            position += length
+        created_at, updated_at = (datetime.fromisoformat(v) if v else None for v in fields[5:])
+        return TermRecord(self._ids[index], *fields[:5], created_at, updated_at)
+
+    def _term_at(self, order_position: int) -> str:
+        index = self._term_order[order_position]
+        start = self._offsets[index] + FIELD_LENGTHS.size
+        length = FIELD_LENGTHS.unpack_from(self._view, self._offsets[index])[0]
+        return normalize_term(str(self._view[start:start + length], "utf-8"))
+
+    def get(self, term_id: int) -> Optional[TermRecord]:
+        index = bisect_left(self._ids, term_id)
+        if index < len(self._ids) and self._ids[index] == term_id:
+            return self.record(index)
+        return None
+
+    def find(self, term: str) -> Optional[TermRecord]:
+        key = normalize_term(term)
+        lo, hi = 0, len(self._term_order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._term_order) and self._term_at(lo) == key:
+            return self.record(self._term_order[lo])
+        return None
+
+
+class SnapshotReader:
+    """Per-process handle on the directory's current generation"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._catalog: Optional[SnapshotCatalog] = None
+
+    def current(self) -> Optional[SnapshotCatalog]:
+        try:
+            st = os.stat(os.path.join(self.directory, CURRENT_FILE))
+        except FileNotFoundError:
+            return None
+        # CURRENT is replaced, never rewritten, so a new generation
+        # always shows up as a new inode
+        stamp = (st.st_ino, st.st_mtime_ns)
+        if stamp == self._stamp:
+            return self._catalog
+
+        with self._lock:
+            if stamp != self._stamp:
+                for attempt in range(KEEP_GENERATIONS):
+                    path = snapshot_path(self.directory, read_generation(self.directory))
+                    try:
+                        catalog = SnapshotCatalog(path)
+                        break
+                    except FileNotFoundError:
+                        # Pruned between reading CURRENT and opening it; read again
+                        if attempt == KEEP_GENERATIONS - 1:
+                            raise
+                self._catalog, self._stamp = catalog, stamp
+        return self._catalog
@@ -1,11 +1,25 @@
+import os
+import shutil
 import sqlite3
+import tempfile
+from contextvars import ContextVar
+from typing import List, Optional
+
 import pytest
+
+# Keep the shared failed-login log out of the source tree; must be set
+# before config.settings is created by the imports below
+_THROTTLE_DIR = None
+if "TECH_VOCAB_AUTH_THROTTLE_DB" not in os.environ:
+    _THROTTLE_DIR = tempfile.mkdtemp(prefix="tech-vocab-tests-")
+    os.environ["TECH_VOCAB_AUTH_THROTTLE_DB"] = os.path.join(_THROTTLE_DIR, "auth_throttle.db")
+
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from main import app
-from database import Base, get_db
+from database import Base, get_db, engine, read_engine
 from auth_utils import create_access_token
 
 # -------------------- SQLITE TEST DB --------------------
@@ -26,16 +40,142 @@ def init_test_results_db():
             timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
         )
     """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS query_counts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            test_name TEXT,
+            endpoint TEXT,
+            method TEXT,
+            statements INTEGER,
+            budget INTEGER,
+            result TEXT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
     conn.commit()
     conn.close()
 
 init_test_results_db()
 
+# -------------------- QUERY BUDGET --------------------
+#
+# Every request made through the client fixture records the SQL statements
+# it issued on database.engine and database.read_engine. A test declares a
+# ceiling per endpoint with
+#
+#     @pytest.mark.query_budget("GET /api/terms/{term_id}", 1)
+#
+# (route template, optionally prefixed with the method) and fails if any
+# matching request goes over. Counts for every request, budgeted or not,
+# are written to the query_counts table.
+
+class QueryLog:
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route = path
+        self.statements: List[str] = []
+
+
+_query_log: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    # Runs in the route's thread; the ContextVar is copied into the
+    # threadpool, while background flusher threads never see it
+    log = _query_log.get()
+    if log is not None:
+        log.statements.append(statement)
+
+
+for _engine in {engine, read_engine}:
+    event.listen(_engine, "before_cursor_execute", _count_statement)
+
+
+class QueryCountingApp:
+    """ASGI wrapper that opens a QueryLog for each HTTP request"""
+
+    def __init__(self, app):
+        self.app = app
+        self.logs: List[QueryLog] = []
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        log = QueryLog(scope["method"], scope["path"])
+        token = _query_log.set(log)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _query_log.reset(token)
+            log.route = getattr(scope.get("route"), "path", log.path)
+            self.logs.append(log)
+
+
+def pytest_unconfigure(config):
+    if _THROTTLE_DIR:
+        shutil.rmtree(_THROTTLE_DIR, ignore_errors=True)
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(endpoint, max_queries): fail if a request to endpoint issues more SQL statements"
+    )
+
+
+def _budget_for(budgets: dict, log: QueryLog) -> Optional[int]:
+    budget = budgets.get(f"{log.method} {log.route}")
+    return budgets.get(log.route) if budget is None else budget
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    result = yield
+    counting = getattr(item, "query_counting_app", None)
+    if counting is None:
+        return result
+
+    budgets = {}
+    for marker in reversed(list(item.iter_markers("query_budget"))):
+        endpoint, max_queries = marker.args
+        budgets[endpoint] = max_queries
+
+    rows, over = [], []
+    for log in counting.logs:
+        budget = _budget_for(budgets, log)
+        passed = budget is None or len(log.statements) <= budget
+        rows.append((item.name, log.route, log.method, len(log.statements), budget,
+                     None if budget is None else ("PASS" if passed else "FAIL")))
+        if not passed:
+            over.append(log)
+
+    conn = sqlite3.connect(TEST_RESULTS_DB)
+    conn.executemany(
+        """
+        INSERT INTO query_counts (test_name, endpoint, method, statements, budget, result)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        rows
+    )
+    conn.commit()
+    conn.close()
+
+    if over:
+        pytest.fail("\n\n".join(
+            f"{log.method} {log.route} issued {len(log.statements)} statements "
+            f"(budget {_budget_for(budgets, log)}):\n  " + "\n  ".join(log.statements)
+            for log in over
+        ), pytrace=False)
+    return result
+
 # -------------------- API CLIENT FIXTURE --------------------
 
 @pytest.fixture
-def client():
-    return TestClient(app)
+def client(request):
+    counting = QueryCountingApp(app)
+    request.node.query_counting_app = counting
+    return TestClient(counting)
 
 # -------------------- RESULT LOGGER FIXTURE --------------------
 
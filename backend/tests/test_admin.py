@@ -1,3 +1,7 @@
+import json
+import pytest
+
+
 def test_create_term(client, db, admin_token, log_result):
     response = client.post(
         "/api/admin/terms",
@@ -13,3 +17,162 @@ def test_create_term(client, db, admin_token, log_result):
 
     log_result(db, "test_create_term", "/api/admin/terms", "POST", 200, response.status_code)
     assert response.status_code == 200
+
+
+def test_update_term_refreshes_catalog(client, db, admin_token, log_result):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    client.get("/api/terms/1", headers=headers)
+
+    response = client.put(
+        "/api/admin/terms/1",
+        headers=headers,
+        json={"difficulty": "hard"}
+    )
+
+    log_result(db, "test_update_term_refreshes_catalog", "/api/admin/terms/1", "PUT", 200, response.status_code)
+    assert response.status_code == 200
+    assert client.get("/api/terms/1", headers=headers).json()["difficulty"] == "hard"
+
+
+def test_update_term_publishes_shared_snapshot(client, db, admin_token, log_result, tmp_path, monkeypatch):
+    import term_cache
+    from config import settings
+    from term_snapshot import SnapshotReader
+
+    monkeypatch.setattr(settings, "term_snapshot_dir", str(tmp_path))
+    monkeypatch.setattr(term_cache, "_reader", None)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    other_worker = SnapshotReader(str(tmp_path))
+    client.get("/api/terms/2", headers=headers)
+    before = other_worker.current().version
+
+    response = client.put(
+        "/api/admin/terms/2",
+        headers=headers,
+        json={"example": "Authorization: Bearer <jwt>"}
+    )
+
+    log_result(db, "test_update_term_publishes_shared_snapshot", "/api/admin/terms/2", "PUT", 200, response.status_code)
+    assert response.status_code == 200
+    assert other_worker.current().version == before + 1
+    assert other_worker.current().get(2).example == "Authorization: Bearer <jwt>"
+    assert client.get("/api/terms/2", headers=headers).json()["example"] == "Authorization: Bearer <jwt>"
+
+
+def test_all_scores_keyset_pages(client, db, admin_token, user_token, log_result):
+    for correct in (1, 2, 3):
+        client.post(
+            "/api/scores",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"correct": correct, "total": 3}
+        )
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    first = client.get("/api/admin/scores/all?limit=2", headers=headers)
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/api/admin/scores/all?limit=2&cursor={cursor}", headers=headers)
+
+    log_result(db, "test_all_scores_keyset_pages", "/api/admin/scores/all", "GET", 200, second.status_code)
+    assert second.status_code == 200
+    first_ids = {s["id"] for s in first.json()}
+    assert len(first_ids) == 2
+    assert first_ids.isdisjoint(s["id"] for s in second.json())
+
+
+@pytest.mark.query_budget("GET /api/admin/users", 2)
+def test_all_users_stream(client, db, admin_token, log_result):
+    response = client.get(
+        "/api/admin/users?stream=true",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    log_result(db, "test_all_users_stream", "/api/admin/users", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert "admin" in [json.loads(line)["username"] for line in response.text.splitlines()]
+
+
+def test_import_terms_upserts(client, db, admin_token, log_result):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    body = "\n".join(json.dumps(t) for t in [
+        {"term": "Bulk Import", "definition": "Loading many rows at once", "example": "term_io.py import",
+         "realWorld": "Seeding a catalog", "difficulty": "easy"},
+        {"term": "Bulk Import", "definition": "Loading many rows in one go", "example": "term_io.py import",
+         "realWorld": "Seeding a catalog", "difficulty": "medium"},
+    ])
+
+    response = client.post("/api/admin/terms/import", headers=headers, content=body)
+
+    log_result(db, "test_import_terms_upserts", "/api/admin/terms/import", "POST", 200, response.status_code)
+    assert response.status_code == 200
+    exported = client.get("/api/admin/terms/export", headers=headers).text.splitlines()
+    imported = [json.loads(line) for line in exported if '"Bulk Import"' in line]
+    assert [t["difficulty"] for t in imported] == ["medium"]
+
+
+def test_all_users_fast_json_matches_models(client, db, admin_token, log_result, monkeypatch):
+    from config import settings
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    expected = client.get("/api/admin/users?limit=1", headers=headers)
+    monkeypatch.setattr(settings, "fast_json_responses", True)
+
+    response = client.get("/api/admin/users?limit=1", headers=headers)
+
+    log_result(db, "test_all_users_fast_json_matches_models", "/api/admin/users", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    assert response.content == expected.content
+    assert response.headers["x-next-cursor"] == expected.headers["x-next-cursor"]
+
+
+def test_term_analytics_reads_compacted_answers(client, db, user_token, admin_token, log_result, monkeypatch):
+    import answer_log
+    from config import settings
+
+    monkeypatch.setattr(settings, "analytics_min_attempts", 4)
+    headers = {"Authorization": f"Bearer {user_token}"}
+    for response_ms in (800, 1200, 1300, 2500):
+        client.post("/api/quiz/check", headers=headers,
+                    json={"term_id": 6, "user_answer": "CI/CD", "response_ms": response_ms})
+    assert answer_log.answer_queue.drain(timeout=5)
+    answer_log.compact()
+
+    response = client.get(
+        "/api/admin/analytics/terms?mismatched_only=true",
+        headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    log_result(db, "test_term_analytics_reads_compacted_answers", "/api/admin/analytics/terms", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    row = next(r for r in response.json()["terms"] if r["term_id"] == 6)
+    assert (row["difficulty"], row["suggested_difficulty"]) == ("hard", "easy")
+    assert row["attempts"] >= 4 and row["accuracy"] == 1.0
+    assert 1000 <= row["median_response_ms"] <= 1500
+
+
+def test_profiled_request_is_stored_for_admins(db, admin_token, user_token, log_result, tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+    from config import settings
+    from main import app
+    from profiling import ProfilingMiddleware
+
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profile_keep", 2)
+    client = TestClient(ProfilingMiddleware(app))
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+
+    ignored = client.get("/api/stats?profile=1", headers={"Authorization": f"Bearer {user_token}"})
+    for _ in range(3):
+        response = client.get("/api/admin/scores/all?profile=1", headers=admin_headers)
+
+    log_result(db, "test_profiled_request_is_stored_for_admins", "/api/admin/scores/all", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    assert "x-profile-id" not in ignored.headers
+    profile_id = response.headers["x-profile-id"]
+    profiles = client.get("/api/admin/profiles", headers=admin_headers).json()
+    assert [p["id"] for p in profiles][0] == profile_id
+    assert len(profiles) == 2
+    assert profiles[0]["route"] == "/api/admin/scores/all"
+    download = client.get(f"/api/admin/profiles/{profile_id}", headers=admin_headers)
+    assert download.status_code == 200
+    assert client.get("/api/admin/profiles/not-a-profile", headers=admin_headers).status_code == 422
@@ -0,0 +1,104 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from database import dispose_async_engines
+from routers.aio import admin, auth, quiz, user
+
+# -------------------- ASYNC STACK CLIENT --------------------
+
+@pytest.fixture
+def aio_client():
+    # The app main.py builds with TECH_VOCAB_DB_ASYNC=1
+    app = FastAPI()
+    for module in (auth, user, quiz, admin):
+        app.include_router(module.router)
+    with TestClient(app) as client:
+        yield client
+        # Pooled aiosqlite connections belong to this client's event loop
+        client.portal.call(dispose_async_engines)
+
+
+def test_aio_get_terms(aio_client, db, user_token, log_result):
+    response = aio_client.get(
+        "/api/terms",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+
+    log_result(db, "test_aio_get_terms", "/api/terms", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    assert any(t["term"] == "Docker" for t in response.json())
+
+
+def test_aio_check_batch_saves_score(aio_client, db, user_token, log_result):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    terms = aio_client.get("/api/terms", headers=headers).json()[:2]
+
+    response = aio_client.post(
+        "/api/quiz/check-batch",
+        headers=headers,
+        json={"answers": [
+            {"term_id": terms[0]["id"], "user_answer": terms[0]["term"]},
+            {"term_id": terms[1]["id"], "user_answer": "wrong"},
+        ]}
+    )
+
+    log_result(db, "test_aio_check_batch_saves_score", "/api/quiz/check-batch", "POST", 200, response.status_code)
+    assert response.status_code == 200
+    assert response.json()["score"]["correct"] == 1
+    history = aio_client.get("/api/scores/my-history?limit=1", headers=headers).json()
+    assert history[0]["id"] == response.json()["score"]["id"]
+
+
+def test_aio_admin_routes_require_admin(aio_client, db, user_token, log_result):
+    response = aio_client.get(
+        "/api/admin/users",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+
+    log_result(db, "test_aio_admin_routes_require_admin", "/api/admin/users", "GET", 403, response.status_code)
+    assert response.status_code == 403
+
+
+def test_aio_leaderboard_loads_cold_board(aio_client, db, user_token, log_result):
+    import leaderboard
+
+    leaderboard._boards.clear()
+    response = aio_client.get(
+        "/api/leaderboard?period=all",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+
+    log_result(db, "test_aio_leaderboard_loads_cold_board", "/api/leaderboard", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    assert response.json()["window"] == leaderboard.ALL_TIME
+    assert leaderboard.ALL_TIME in leaderboard._boards
+
+
+def test_aio_terms_compress_off_the_loop(aio_client, db, user_token, log_result, monkeypatch):
+    import asyncio
+    import http_cache
+    import term_cache
+
+    compress = http_cache.gzip.compress
+    on_loop = []
+
+    def tracking_compress(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return compress(*args, **kwargs)
+
+    monkeypatch.setattr(http_cache.gzip, "compress", tracking_compress)
+    term_cache.invalidate()  # a cold body, so the gzip variant is built by this request
+    response = aio_client.get(
+        "/api/terms",
+        headers={"Authorization": f"Bearer {user_token}", "Accept-Encoding": "gzip"}
+    )
+
+    log_result(db, "test_aio_terms_compress_off_the_loop", "/api/terms", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert on_loop == [False]
@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_register_user(client, db, log_result):
     response = client.post(
         "/api/auth/register",
@@ -20,3 +23,83 @@ def test_login_user(client, db, log_result):
 
     log_result(db, "test_login_user", "/api/auth/login", "POST", 200, response.status_code)
     assert response.status_code == 200
+
+
+@pytest.mark.query_budget("GET /api/auth/me", 2)
+def test_me_uses_principal_cache(client, db, user_token, log_result):
+    from auth_utils import principal_cache
+
+    headers = {"Authorization": f"Bearer {user_token}"}
+    client.get("/api/auth/me", headers=headers)
+    hits = principal_cache.hits
+
+    response = client.get("/api/auth/me", headers=headers)
+
+    log_result(db, "test_me_uses_principal_cache", "/api/auth/me", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    assert response.json()["username"] == "user"
+    assert principal_cache.hits == hits + 1
+
+
+def test_login_sheds_load_when_hash_pool_full(client, db, log_result, monkeypatch):
+    import auth_utils
+    from executors import BoundedExecutor
+
+    full_pool = BoundedExecutor("test-password-hash", 1, 0)
+    full_pool._slots.acquire()
+    monkeypatch.setattr(auth_utils, "password_executor", full_pool)
+
+    response = client.post(
+        "/api/auth/login",
+        data={"username": "user", "password": "user123"}
+    )
+
+    log_result(db, "test_login_sheds_load_when_hash_pool_full", "/api/auth/login", "POST", 503, response.status_code)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_login_throttled_before_hashing(client, db, log_result, monkeypatch, tmp_path):
+    import auth_utils
+    import rate_limit
+    from config import Settings
+
+    cfg = Settings(login_user_burst=2, login_ip_burst=3, auth_throttle_db=str(tmp_path / "throttle.db"))
+    monkeypatch.setattr(rate_limit, "auth_throttle", rate_limit.AuthThrottle(cfg))
+    for _ in range(2):
+        client.post("/api/auth/login", data={"username": "user", "password": "user123"})
+    hashed = auth_utils.password_executor.submitted
+
+    response = client.post(
+        "/api/auth/login",
+        data={"username": "USER", "password": "user123"}
+    )
+
+    log_result(db, "test_login_throttled_before_hashing", "/api/auth/login", "POST", 429, response.status_code)
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert auth_utils.password_executor.submitted == hashed
+    # The rejected attempt gave its token back, so the IP can still log in as someone else
+    other = client.post("/api/auth/login", data={"username": "admin", "password": "admin123"})
+    assert other.status_code == 200
+
+
+def test_login_locked_after_repeated_failures(client, db, log_result, monkeypatch, tmp_path):
+    import rate_limit
+    from config import Settings
+
+    cfg = Settings(login_max_failures_per_user=3, auth_throttle_db=str(tmp_path / "throttle.db"))
+    monkeypatch.setattr(rate_limit, "auth_throttle", rate_limit.AuthThrottle(cfg))
+    for _ in range(3):
+        client.post("/api/auth/login", data={"username": "admin", "password": "wrong"})
+    # A second worker shares the failures through the SQLite file
+    other_worker = rate_limit.AuthThrottle(cfg)
+
+    response = client.post(
+        "/api/auth/login",
+        data={"username": "admin", "password": "admin123"}
+    )
+
+    log_result(db, "test_login_locked_after_repeated_failures", "/api/auth/login", "POST", 429, response.status_code)
+    assert response.status_code == 429
+    assert other_worker.failures.recent("user:admin")[0] == 3
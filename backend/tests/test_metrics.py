@@ -0,0 +1,32 @@
+def test_metrics_requires_admin(client, db, user_token, log_result):
+    response = client.get(
+        "/metrics",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+
+    log_result(db, "test_metrics_requires_admin", "/metrics", "GET", 403, response.status_code)
+    assert response.status_code == 403
+
+
+def test_metrics_reports_route_latency(client, db, admin_token, log_result):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    client.get("/api/admin/users", headers=headers)
+
+    response = client.get("/metrics", headers=headers)
+
+    log_result(db, "test_metrics_reports_route_latency", "/metrics", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/admin/users"}' in response.text
+    assert 'db_statements_per_request_bucket{method="GET",route="/api/admin/users"' in response.text
+
+
+def test_metrics_declares_each_family_once(client, db, admin_token, log_result):
+    response = client.get("/metrics", headers={"Authorization": f"Bearer {admin_token}"})
+
+    log_result(db, "test_metrics_declares_each_family_once", "/metrics", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    types = [line.split()[2] for line in response.text.splitlines() if line.startswith("# TYPE ")]
+    assert len(types) == len(set(types))
+    # Both queues report under the one write_queue_depth family
+    assert 'write_queue_depth{queue="scores"}' in response.text
+    assert 'write_queue_depth{queue="answer_events"}' in response.text
@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_random_quiz(client, db, user_token, log_result):
     response = client.get(
         "/api/quiz/random",
@@ -6,3 +9,122 @@ def test_random_quiz(client, db, user_token, log_result):
 
     log_result(db, "test_random_quiz", "/api/quiz/random", "GET", 200, response.status_code)
     assert response.status_code == 200
+
+
+def test_random_quiz_by_difficulty(client, db, user_token, log_result):
+    response = client.get(
+        "/api/quiz/random?count=3&difficulty=hard",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+
+    log_result(db, "test_random_quiz_by_difficulty", "/api/quiz/random", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    assert all(q["difficulty"] == "hard" for q in response.json()["questions"])
+
+
+@pytest.mark.query_budget("POST /api/quiz/check-batch", 13)
+def test_check_batch_grades_and_saves_score(client, db, user_token, log_result):
+    response = client.post(
+        "/api/quiz/check-batch",
+        headers={"Authorization": f"Bearer {user_token}"},
+        json={"answers": [
+            {"term_id": 1, "user_answer": " api "},
+            {"term_id": 2, "user_answer": "wrong"}
+        ]}
+    )
+
+    log_result(db, "test_check_batch_grades_and_saves_score", "/api/quiz/check-batch", "POST", 200, response.status_code)
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["correct"] for r in body["results"]] == [True, False]
+    assert (body["score"]["correct"], body["score"]["total"]) == (1, 2)
+
+
+@pytest.mark.query_budget("POST /api/quiz/check", 4)
+def test_check_accepts_near_miss(client, db, user_token, log_result):
+    response = client.post(
+        "/api/quiz/check",
+        headers={"Authorization": f"Bearer {user_token}"},
+        json={"term_id": 11, "user_answer": "Kubernates"}
+    )
+
+    log_result(db, "test_check_accepts_near_miss", "/api/quiz/check", "POST", 200, response.status_code)
+    assert response.status_code == 200
+    assert response.json()["correct"] is True
+
+
+def test_check_suggests_closest_term(client, db, user_token, log_result):
+    response = client.post(
+        "/api/quiz/check",
+        headers={"Authorization": f"Bearer {user_token}"},
+        json={"term_id": 1, "user_answer": "Dockr"}
+    )
+
+    log_result(db, "test_check_suggests_closest_term", "/api/quiz/check", "POST", 200, response.status_code)
+    assert response.status_code == 200
+    assert response.json()["correct"] is False
+    assert response.json()["suggestion"] == "Docker"
+
+
+def test_due_quiz_skips_terms_scheduled_later(client, db, user_token, log_result):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    client.post("/api/quiz/check", headers=headers, json={"term_id": 4, "user_answer": "wrong"})
+
+    response = client.get("/api/quiz/due?count=3", headers=headers)
+
+    log_result(db, "test_due_quiz_skips_terms_scheduled_later", "/api/quiz/due", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    ids = [q["id"] for q in response.json()["questions"]]
+    assert len(ids) == len(set(ids)) == 3
+    assert 4 not in ids
+
+
+def test_check_rejects_oversized_answer(client, db, user_token, log_result):
+    response = client.post(
+        "/api/quiz/check",
+        headers={"Authorization": f"Bearer {user_token}"},
+        json={"term_id": 1, "user_answer": "x" * 20_000}
+    )
+
+    log_result(db, "test_check_rejects_oversized_answer", "/api/quiz/check", "POST", 422, response.status_code)
+    assert response.status_code == 422
+
+
+def test_check_ignores_definition_head_of_non_acronym(client, db, user_token, admin_token, log_result):
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    created = client.post(
+        "/api/admin/terms",
+        headers=admin_headers,
+        json={
+            "term": "Sidecar",
+            "definition": "Helper container - runs next to the main app in a pod",
+            "example": "A logging sidecar",
+            "real_world": "Service meshes inject proxies as sidecars",
+            "difficulty": "medium"
+        }
+    )
+    assert created.status_code == 200
+    term_id = created.json()["id"]
+
+    try:
+        response = client.post(
+            "/api/quiz/check",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"term_id": term_id, "user_answer": "Helper container"}
+        )
+
+        log_result(db, "test_check_ignores_definition_head_of_non_acronym", "/api/quiz/check", "POST", 200, response.status_code)
+        assert response.status_code == 200
+        assert response.json()["correct"] is False
+    finally:
+        client.delete(f"/api/admin/terms/{term_id}", headers=admin_headers)
+
+
+def test_random_quiz_rejects_non_finite_weights(client, db, user_token, log_result):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    response = client.get("/api/quiz/random?weights=easy:inf,hard:nan", headers=headers)
+    overflow = client.get("/api/quiz/random?weights=easy:1e308,hard:1e308", headers=headers)
+
+    log_result(db, "test_random_quiz_rejects_non_finite_weights", "/api/quiz/random", "GET", 400, response.status_code)
+    assert response.status_code == 400
+    assert overflow.status_code == 400
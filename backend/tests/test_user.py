@@ -1,3 +1,7 @@
+import pytest
+
+
+@pytest.mark.query_budget("GET /api/terms", 2)
 def test_get_terms(client, db, user_token, log_result):
     response = client.get(
         "/api/terms",
@@ -16,3 +20,136 @@ def test_stats(client, db, user_token, log_result):
 
     log_result(db, "test_stats", "/api/stats", "GET", 200, response.status_code)
     assert response.status_code == 200
+
+
+@pytest.mark.query_budget("POST /api/scores", 7)
+@pytest.mark.query_budget("GET /api/stats", 2)
+def test_stats_counts_saved_score(client, db, user_token, log_result):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    before = client.get("/api/stats", headers=headers).json()["total_quizzes"]
+
+    response = client.post("/api/scores", headers=headers, json={"correct": 3, "total": 4})
+
+    log_result(db, "test_stats_counts_saved_score", "/api/scores", "POST", 200, response.status_code)
+    assert response.status_code == 200
+    assert client.get("/api/stats", headers=headers).json()["total_quizzes"] == before + 1
+
+
+def test_search_terms_ranks_term_match_first(client, db, user_token, log_result):
+    response = client.get(
+        "/api/terms/search?q=docker",
+        headers={"Authorization": f"Bearer {user_token}"}
+    )
+
+    log_result(db, "test_search_terms_ranks_term_match_first", "/api/terms/search", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    results = [t["term"] for t in response.json()]
+    assert results[0] == "Docker"
+    assert "Kubernetes" in results
+
+
+def test_get_terms_not_modified(client, db, user_token, log_result):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    first = client.get("/api/terms", headers=headers)
+    assert first.headers["content-encoding"] == "gzip"
+
+    response = client.get(
+        "/api/terms",
+        headers={**headers, "If-None-Match": first.headers["etag"]}
+    )
+
+    log_result(db, "test_get_terms_not_modified", "/api/terms", "GET", 304, response.status_code)
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.query_budget("GET /api/leaderboard", 4)
+def test_leaderboard_ranks_saved_scores(client, db, user_token, admin_token, log_result):
+    user_headers = {"Authorization": f"Bearer {user_token}"}
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    client.post("/api/scores", headers=admin_headers, json={"correct": 1, "total": 10})
+    client.post("/api/scores", headers=user_headers, json={"correct": 50, "total": 50})
+
+    response = client.get("/api/leaderboard?period=weekly&limit=5", headers=user_headers)
+
+    log_result(db, "test_leaderboard_ranks_saved_scores", "/api/leaderboard", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["me"]["username"] == "user"
+    assert data["me"]["rank"] == 1
+    assert data["entries"][0]["user_id"] == data["me"]["user_id"]
+    assert data["me"]["points"] >= 50
+
+
+def test_write_behind_score_is_flushed(client, db, user_token, log_result, monkeypatch):
+    from config import settings
+    from scores import score_queue
+
+    headers = {"Authorization": f"Bearer {user_token}"}
+    before = client.get("/api/stats", headers=headers).json()["total_quizzes"]
+    monkeypatch.setattr(settings, "score_write_mode", "write_behind")
+
+    response = client.post("/api/scores", headers=headers, json={"correct": 9, "total": 9})
+
+    log_result(db, "test_write_behind_score_is_flushed", "/api/scores", "POST", 202, response.status_code)
+    assert response.status_code == 202
+    assert response.json()["id"] is None
+    assert score_queue.drain(timeout=5)
+    history = client.get("/api/scores/my-history?limit=1", headers=headers).json()
+    assert history[0]["created_at"] == response.json()["created_at"]
+    assert client.get("/api/stats", headers=headers).json()["total_quizzes"] == before + 1
+
+
+def test_group_commit_score_returns_saved_row(client, db, user_token, log_result, monkeypatch):
+    from config import settings
+
+    headers = {"Authorization": f"Bearer {user_token}"}
+    monkeypatch.setattr(settings, "score_write_mode", "group")
+
+    response = client.post("/api/scores", headers=headers, json={"correct": 2, "total": 4})
+
+    log_result(db, "test_group_commit_score_returns_saved_row", "/api/scores", "POST", 200, response.status_code)
+    assert response.status_code == 200
+    assert response.json()["id"] is not None
+    assert response.json()["percentage"] == 50.0
+
+
+def test_group_commit_score_fails_with_503(client, db, user_token, log_result, monkeypatch):
+    from concurrent.futures import Future
+    from config import settings
+    from scores import score_queue
+
+    headers = {"Authorization": f"Bearer {user_token}"}
+    monkeypatch.setattr(settings, "score_write_mode", "group")
+    monkeypatch.setattr(settings, "score_queue_wait_margin_seconds", 0)
+    failed = Future()
+    failed.set_exception(RuntimeError("scores: write failed"))
+
+    monkeypatch.setattr(score_queue, "submit", lambda item: Future())  # never commits
+    stalled = client.post("/api/scores", headers=headers, json={"correct": 1, "total": 2})
+    monkeypatch.setattr(score_queue, "submit", lambda item: failed)
+    response = client.post("/api/scores", headers=headers, json={"correct": 1, "total": 2})
+
+    log_result(db, "test_group_commit_score_fails_with_503", "/api/scores", "POST", 503, response.status_code)
+    assert stalled.status_code == 503
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.mark.query_budget("GET /api/stats/me", 4)
+def test_my_stats_reports_today_and_streak(client, db, user_token, log_result):
+    headers = {"Authorization": f"Bearer {user_token}"}
+    before = client.get("/api/stats/me?days=7", headers=headers).json()
+    client.post("/api/scores", headers=headers, json={"correct": 4, "total": 4})
+
+    response = client.get("/api/stats/me?days=7", headers=headers)
+
+    log_result(db, "test_my_stats_reports_today_and_streak", "/api/stats/me", "GET", 200, response.status_code)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_quizzes"] == before["total_quizzes"] + 1
+    assert data["best_score"] == 100.0
+    assert data["current_streak"] >= 1
+    assert len(data["daily"]) == 7
+    assert data["daily"][-1]["quizzes"] == before["daily"][-1]["quizzes"] + 1
+    assert sum(w["quizzes"] for w in data["weekly"]) == sum(d["quizzes"] for d in data["daily"])
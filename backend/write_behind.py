@@ -0,0 +1,229 @@
+"""Group commit for high-volume inserts.
+
+A ``WriteBehindQueue`` collects items from request handlers and a single
+background thread writes them in batches, one transaction (one fsync) per
+batch. A batch is flushed when it reaches ``max_batch`` items or when its
+oldest item has waited ``max_delay`` seconds, whichever comes first.
+
+``submit`` returns a ``concurrent.futures.Future`` that resolves with the
+item's result once its batch has committed. Callers pick the durability
+they need: wait on the future (group commit, the acknowledgement is
+durable) or return immediately (write-behind, up to ``max_delay`` of
+writes can be lost on a crash). ``close`` drains the queue on shutdown.
+
+If a batch fails for a reason other than lock contention (which
+``run_write`` already retries), its items are retried one by one so a
+single bad item cannot sink the others.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, run_write
+from metrics import LATENCY_BUCKETS, Histogram
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Prometheus rejects a scrape that declares a family twice, so the families
+# are declared here once and every queue only contributes labelled samples
+QUEUE_METRICS = (
+    ("write_queue_depth", "gauge", "Items waiting to be written"),
+    ("write_queue_flushed_total", "counter", "Items committed"),
+    ("write_queue_failed_total", "counter", "Items dropped after their write failed"),
+    ("write_queue_rejected_total", "counter", "Items refused because the queue was full"),
+    ("write_queue_flush_seconds", "histogram", "Time to write one batch"),
+    ("write_queue_batch_size", "histogram", "Items per written batch"),
+)
+
+
+class QueueFull(Exception):
+    """Raised when a WriteBehindQueue already holds max_pending items"""
+
+
+class WriteBehindQueue(Generic[T]):
+    def __init__(
+        self,
+        name: str,
+        apply_batch: Callable[[Session, Sequence[T]], list],
+        max_batch: int,
+        max_delay: float,
+        max_pending: int,
+        session_factory: Callable[[], Session] = SessionLocal
+    ):
+        self.name = name
+        self.apply_batch = apply_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.session_factory = session_factory
+
+        self._cond = threading.Condition()
+        self._items: List[Tuple[float, T, Future]] = []
+        self._busy = False
+        self._force = False
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.flushed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.flush_latency = Histogram(LATENCY_BUCKETS)
+        self.batch_size = Histogram(BATCH_SIZE_BUCKETS)
+
+    def depth(self) -> int:
+        return len(self._items)
+
+    # ================= PRODUCERS =================
+
+    def submit(self, item: T) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._closing:
+                raise RuntimeError(f"{self.name} queue is closed")
+            if len(self._items) >= self.max_pending:
+                self.rejected += 1
+                raise QueueFull(self.name)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"{self.name}-flusher", daemon=True)
+                self._thread.start()
+            self._items.append((time.monotonic(), item, future))
+            if len(self._items) == 1 or len(self._items) >= self.max_batch:
+                self._cond.notify_all()
+        return future
+
+    async def submit_and_wait(self, item: T):
+        return await asyncio.wrap_future(self.submit(item))
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Flush everything queued so far; False if it did not finish in time"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._force = True
+            self._cond.notify_all()
+            try:
+                while self._items or self._busy:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                # Left set, every later batch would flush without waiting max_delay
+                self._force = False
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        drained = self.drain(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return drained
+
+    # ================= FLUSHER =================
+
+    def _next_batch(self) -> Optional[List[Tuple[float, T, Future]]]:
+        with self._cond:
+            while not self._items:
+                if self._closing:
+                    return None
+                self._cond.wait()
+            deadline = self._items[0][0] + self.max_delay
+            while len(self._items) < self.max_batch and not (self._force or self._closing):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._items[:self.max_batch]
+            del self._items[:self.max_batch]
+            self._busy = True
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            try:
+                self._write(batch)
+            finally:
+                self.flush_latency.observe(time.perf_counter() - started)
+                self.batch_size.observe(len(batch))
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _apply(self, entries: List[Tuple[float, T, Future]]) -> None:
+        items = [item for _, item, _ in entries]
+        db = self.session_factory()
+        try:
+            results = run_write(db, lambda session: self.apply_batch(session, items))
+        finally:
+            db.close()
+        for (_, _, future), result in zip(entries, results):
+            future.set_result(result)
+        self.flushed += len(entries)
+
+    def _write(self, batch: List[Tuple[float, T, Future]]) -> None:
+        try:
+            self._apply(batch)
+            return
+        except Exception:
+            if len(batch) == 1:
+                self._fail(batch[0])
+                return
+        for entry in batch:
+            try:
+                self._apply([entry])
+            except Exception:
+                self._fail(entry)
+
+    def _fail(self, entry: Tuple[float, T, Future]) -> None:
+        _, item, future = entry
+        self.failed += 1
+        logger.exception("%s: dropping item %r", self.name, item)
+        future.set_exception(RuntimeError(f"{self.name}: write failed"))
+
+    # ================= METRICS =================
+
+    def stats(self) -> dict:
+        return {
+            "depth": self.depth(),
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "batches": self.batch_size.count,
+        }
+
+    def metric_samples(self) -> Dict[str, List[str]]:
+        """Samples for each QUEUE_METRICS family, labelled with this queue's name"""
+        labels = f'queue="{self.name}"'
+        return {
+            "write_queue_depth": [f"write_queue_depth{{{labels}}} {self.depth()}"],
+            "write_queue_flushed_total": [f"write_queue_flushed_total{{{labels}}} {self.flushed}"],
+            "write_queue_failed_total": [f"write_queue_failed_total{{{labels}}} {self.failed}"],
+            "write_queue_rejected_total": [f"write_queue_rejected_total{{{labels}}} {self.rejected}"],
+            "write_queue_flush_seconds": list(self.flush_latency.render("write_queue_flush_seconds", labels)),
+            "write_queue_batch_size": list(self.batch_size.render("write_queue_batch_size", labels)),
+        }
+
+
+def queue_metric_lines(queues: Sequence["WriteBehindQueue"]) -> List[str]:
+    """Each family's HELP/TYPE once, followed by the samples of every queue"""
+    samples = [queue.metric_samples() for queue in queues]
+    lines = []
+    for name, kind, help_text in QUEUE_METRICS:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for queue_samples in samples:
+            lines.extend(queue_samples[name])
+    return lines